@@ -2,21 +2,105 @@
 Dataset Explorer - Interactive analysis of the synthetic funding dataset
 """
 
+import os
+import importlib.util
 import pandas as pd
 import json
+from functools import lru_cache
+from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # optional - stdlib json parses the same file, just slower
+    orjson = None
+
+# Low-cardinality text columns, loaded as categoricals
+CATEGORY_COLUMNS = ['Sector_Standardized', 'City', 'State_Standardized']
+
+# Narrow integer code column stored next to each categorical
+CODE_COLUMNS = {'Sector_Standardized': 'Sector_code', 'City': 'City_code', 'State_Standardized': 'State_code'}
+
+# Columns the menu views actually read from each file
+MAIN_COLUMNS = ['Startup Name', 'Sector_Standardized', 'City', 'State_Standardized', "Investors' Name", 'Year']
+EXTENDED_COLUMNS = MAIN_COLUMNS + ['Amount_INR_Numeric', 'Date_Parsed', 'Funding_Stage', 'Amount_Cleaned']
+
+# Searchable columns get a lowercased '<col>_lc' copy at load time
+SEARCH_COLUMNS = ['Startup Name', 'Sector_Standardized', 'City']
+SEARCH_DTYPE = 'string[pyarrow]' if importlib.util.find_spec('pyarrow') else 'string'
+
+def read_funding_csv(path):
+    """Read a funding CSV with categorical text columns and parsed dates"""
+    return pd.read_csv(
+        path,
+        dtype={col: 'category' for col in CATEGORY_COLUMNS},
+        parse_dates=['Date_Parsed']
+    )
+
+def read_funding_table(csv_path, columns):
+    """Read the needed columns from a Parquet copy of the CSV, converting it on first use"""
+    parquet_path = csv_path.replace('.csv', '.parquet')
+    try:
+        if os.path.exists(csv_path) and (
+            not os.path.exists(parquet_path) or os.path.getmtime(parquet_path) < os.path.getmtime(csv_path)
+        ):
+            read_funding_csv(csv_path).to_parquet(parquet_path, compression='zstd', index=False)
+        return pd.read_parquet(parquet_path, columns=columns)
+    except ImportError:
+        # pyarrow not installed - fall back to parsing the CSV
+        return read_funding_csv(csv_path)[columns]
+
+def add_search_columns(df):
+    """Add lowercased copies of the searchable columns so searches skip per-call lowercasing"""
+    for col in SEARCH_COLUMNS:
+        df[col + '_lc'] = df[col].astype(SEARCH_DTYPE).str.lower()
+    return df
+
+def add_code_columns(df):
+    """Add the categorical codes as plain integer columns (int8 for these few categories)"""
+    for col, code_col in CODE_COLUMNS.items():
+        df[code_col] = df[col].astype('category').cat.codes
+    return df
+
+def contains(df, col, term):
+    """Case-insensitive literal substring match on a searchable column"""
+    return df[col + '_lc'].str.contains(term.lower(), regex=False).fillna(False).astype(bool)
+
+# Loaders are memoized so each file is parsed once per session.
+# Callers share the returned objects and must not modify them.
+@lru_cache(maxsize=None)
 def load_dataset():
     """Load the main dataset"""
-    return pd.read_csv('cleaned_funding_synthetic_2010_2025.csv')
+    return add_code_columns(add_search_columns(read_funding_table('cleaned_funding_synthetic_2010_2025.csv', MAIN_COLUMNS)))
 
+@lru_cache(maxsize=None)
 def load_extended_dataset():
     """Load the extended dataset"""
-    return pd.read_csv('cleaned_funding_synthetic_2010_2025_extended.csv')
+    return add_code_columns(add_search_columns(read_funding_table('cleaned_funding_synthetic_2010_2025_extended.csv', EXTENDED_COLUMNS)))
+
+@lru_cache(maxsize=None)
+def load_investors():
+    """Load the long-format investor table: one (row_id, investor) row per deal participant"""
+    investors = load_dataset()["Investors' Name"].str.split(', ').explode()
+    # Investor names repeat across thousands of deals - intern them as a categorical
+    investors = investors.dropna().astype('category').rename('investor')
+    return investors.rename_axis('row_id').reset_index()
 
+@lru_cache(maxsize=None)
 def load_metadata():
     """Load metadata"""
-    with open('cleaned_funding_synthetic_2010_2025_metadata.json', 'r') as f:
-        return json.load(f)
+    raw = Path('cleaned_funding_synthetic_2010_2025_metadata.json').read_bytes()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+# Aggregates computed by the menu views, keyed by (name, id(df)). The memoized
+# loaders keep each frame alive and unchanged, so its id stays valid.
+_aggregates = {}
+
+def cached_aggregate(name, df, compute):
+    """Compute an aggregate over df once and reuse it on later menu selections"""
+    key = (name, id(df))
+    if key not in _aggregates:
+        _aggregates[key] = compute(df)
+    return _aggregates[key]
 
 def explore_menu():
     """Interactive exploration menu"""
@@ -34,6 +118,8 @@ def explore_menu():
         print("1. Year-wise funding trends")
         print("2. Sector analysis")
         print("3. City/State distribution")
+        print("   3a. Top cities only")
+        print("   3b. State distribution only")
         print("4. Company deep dive")
         print("5. Investor analysis")
         print("6. Search by company name")
@@ -54,10 +140,14 @@ def explore_menu():
             sector_analysis(df)
         elif choice == '3':
             location_analysis(df)
+        elif choice == '3a':
+            top_cities(df)
+        elif choice == '3b':
+            state_distribution(df)
         elif choice == '4':
             company_deep_dive(df_ext)
         elif choice == '5':
-            investor_analysis(df)
+            investor_analysis(load_investors())
         elif choice == '6':
             search_by_company(df_ext)
         elif choice == '7':
@@ -71,11 +161,7 @@ def explore_menu():
         else:
             print("❌ Invalid choice. Please try again.")
 
-def year_wise_analysis(df):
-    """Analyze funding trends by year"""
-    print("\n📅 YEAR-WISE FUNDING TRENDS")
-    print("=" * 70)
-    
+def _yearly_totals(df):
     yearly = df.groupby('Year').agg({
         'Startup Name': 'count',
         'Amount_INR_Numeric': 'sum'
@@ -83,6 +169,14 @@ def year_wise_analysis(df):
     yearly.columns = ['Total Deals', 'Total Amount (INR)']
     yearly['Avg Deal Size (Cr)'] = (yearly['Total Amount (INR)'] / yearly['Total Deals']) / 10000000
     yearly['Total Amount (Cr)'] = yearly['Total Amount (INR)'] / 10000000
+    return yearly
+
+def year_wise_analysis(df):
+    """Analyze funding trends by year"""
+    print("\n📅 YEAR-WISE FUNDING TRENDS")
+    print("=" * 70)
+    
+    yearly = cached_aggregate('yearly', df, _yearly_totals)
     
     print(yearly[['Total Deals', 'Total Amount (Cr)', 'Avg Deal Size (Cr)']].to_string())
     
@@ -97,7 +191,7 @@ def sector_analysis(df):
     print("=" * 70)
     
     print("\n📊 Top Sectors by Deal Count:")
-    sector_counts = df['Sector_Standardized'].value_counts()
+    sector_counts = cached_aggregate('sector_counts', df, lambda d: d['Sector_Standardized'].value_counts())
     for sector, count in sector_counts.items():
         pct = (count / len(df)) * 100
         print(f"{sector:20s}: {count:5d} deals ({pct:.1f}%)")
@@ -105,8 +199,10 @@ def sector_analysis(df):
     print("\n💰 Want to see funding amounts by sector? (y/n): ", end='')
     if input().strip().lower() == 'y':
         df_ext = load_extended_dataset()
-        sector_funding = df_ext.groupby('Sector_Standardized')['Amount_INR_Numeric'].sum() / 10000000
-        sector_funding = sector_funding.sort_values(ascending=False)
+        sector_funding = cached_aggregate(
+            'sector_funding', df_ext,
+            lambda d: (d.groupby('Sector_Standardized', observed=True)['Amount_INR_Numeric'].sum() / 10000000).sort_values(ascending=False)
+        )
         print("\n💸 Total Funding by Sector (Crores):")
         print(sector_funding.to_string())
 
@@ -115,12 +211,19 @@ def location_analysis(df):
     print("\n🌆 LOCATION ANALYSIS")
     print("=" * 70)
     
+    top_cities(df)
+    state_distribution(df)
+
+def top_cities(df):
+    """Top 15 cities by deal count"""
     print("\n🏙️ Top 15 Cities by Deal Count:")
-    city_counts = df['City'].value_counts().head(15)
+    city_counts = cached_aggregate('city_counts', df, lambda d: d['City'].value_counts()).head(15)
     print(city_counts.to_string())
-    
+
+def state_distribution(df):
+    """Deal count per state"""
     print("\n🗺️ State-wise Distribution:")
-    state_counts = df['State_Standardized'].value_counts()
+    state_counts = cached_aggregate('state_counts', df, lambda d: d['State_Standardized'].value_counts())
     print(state_counts.to_string())
 
 def company_deep_dive(df):
@@ -129,14 +232,14 @@ def company_deep_dive(df):
     print("=" * 70)
     
     print("\n📈 Top 20 Most Active Companies:")
-    company_counts = df['Startup Name'].value_counts().head(20)
+    company_counts = cached_aggregate('company_counts', df, lambda d: d['Startup Name'].value_counts()).head(20)
     print(company_counts.to_string())
     
     print("\n🔍 Enter company name to see detailed history (or press Enter to skip): ", end='')
     company = input().strip()
     
     if company:
-        company_data = df[df['Startup Name'].str.contains(company, case=False, na=False)]
+        company_data = df[contains(df, 'Startup Name', company)]
         
         if len(company_data) == 0:
             print(f"❌ No data found for '{company}'")
@@ -144,27 +247,36 @@ def company_deep_dive(df):
             print(f"\n📊 Funding History for '{company_data.iloc[0]['Startup Name']}':")
             print("=" * 70)
             
-            for _, row in company_data.sort_values('Date_Parsed').iterrows():
-                print(f"\n📅 {row['Date_Parsed']} ({row['Year']})")
-                print(f"   Stage: {row.get('Funding_Stage', 'N/A')}")
-                print(f"   Amount: {row['Amount_Cleaned']}")
-                print(f"   Sector: {row['Sector_Standardized']}")
-                print(f"   City: {row['City']}, {row['State_Standardized']}")
-                print(f"   Investors: {row['Investors\\' Name']}")
+            history = company_data.sort_values('Date_Parsed')[[
+                'Date_Parsed', 'Year', 'Funding_Stage', 'Amount_Cleaned',
+                'Sector_Standardized', 'City', 'State_Standardized', "Investors' Name"
+            ]]
+            # Plain tuples instead of iterrows: no Series built per round
+            print("".join(
+                f"\n📅 {date:%Y-%m-%d} ({year})\n"
+                f"   Stage: {stage}\n"
+                f"   Amount: {amount}\n"
+                f"   Sector: {sector}\n"
+                f"   City: {city}, {state}\n"
+                f"   Investors: {investors}\n"
+                for date, year, stage, amount, sector, city, state, investors
+                in history.itertuples(index=False, name=None)
+            ), end='')
             
             print(f"\n📊 Summary:")
             print(f"   Total Rounds: {len(company_data)}")
             print(f"   Total Funding: ₹{company_data['Amount_INR_Numeric'].sum() / 10000000:.2f} Cr")
             print(f"   Avg Round Size: ₹{company_data['Amount_INR_Numeric'].mean() / 10000000:.2f} Cr")
 
-def investor_analysis(df):
+def investor_analysis(investors):
     """Analyze investor participation"""
     print("\n💼 INVESTOR ANALYSIS")
     print("=" * 70)
     
-    # Split investors and count
-    all_investors = df['Investors\\' Name'].str.split(', ').explode()
-    investor_counts = all_investors.value_counts().head(20)
+    # Investors were split into a long table at load, so this is a code count
+    investor_counts = cached_aggregate(
+        'investor_counts', investors, lambda d: d['investor'].value_counts().rename_axis("Investors' Name")
+    ).head(20)
     
     print("\n🏆 Top 20 Most Active Investors:")
     print(investor_counts.to_string())
@@ -180,7 +292,7 @@ def search_by_company(df):
         print("❌ Please enter a search term")
         return
     
-    results = df[df['Startup Name'].str.contains(search_term, case=False, na=False)]
+    results = df[contains(df, 'Startup Name', search_term)]
     
     if len(results) == 0:
         print(f"\n❌ No results found for '{search_term}'")
@@ -198,18 +310,25 @@ def search_by_sector(df):
     for i, sector in enumerate(sectors, 1):
         print(f"{i}. {sector}")
     
-    sector = input("\nEnter sector name: ").strip()
+    sector = input("\nEnter sector name or number: ").strip()
     
     if not sector:
         return
     
-    results = df[df['Sector_Standardized'].str.contains(sector, case=False, na=False)]
+    if sector.isdigit() and 1 <= int(sector) <= len(sectors):
+        # Picked from the list: compare the integer code column instead of strings
+        sector = sectors[int(sector) - 1]
+        code = df['Sector_Standardized'].cat.categories.get_loc(sector)
+        results = df[df['Sector_code'].values == code]
+    else:
+        results = df[contains(df, 'Sector_Standardized', sector)]
     
     print(f"\n✅ Found {len(results)} deals in {sector}")
     print(f"📊 Summary:")
     print(f"   Companies: {results['Startup Name'].nunique()}")
     print(f"   Date Range: {results['Year'].min()} - {results['Year'].max()}")
-    print(f"   Top Cities: {results['City'].value_counts().head(5).to_dict()}")
+    city_counts = results['City'].value_counts()
+    print(f"   Top Cities: {city_counts[city_counts > 0].head(5).to_dict()}")
 
 def search_by_city(df):
     """Search by city"""
@@ -221,14 +340,15 @@ def search_by_city(df):
     if not city:
         return
     
-    results = df[df['City'].str.contains(city, case=False, na=False)]
+    results = df[contains(df, 'City', city)]
     
     if len(results) == 0:
         print(f"\n❌ No results found for '{city}'")
     else:
         print(f"\n✅ Found {len(results)} deals in {city}")
         print(f"\n📊 Sector Distribution:")
-        print(results['Sector_Standardized'].value_counts().to_string())
+        sector_counts = results['Sector_Standardized'].value_counts()
+        print(sector_counts[sector_counts > 0].to_string())
         
         print(f"\n🏢 Top Companies:")
         print(results['Startup Name'].value_counts().head(10).to_string())
@@ -291,19 +411,23 @@ def sample_queries():
         ]
     }
     
+    # Collect every line and write once instead of one print per line
+    lines = []
     for category, query_list in queries.items():
-        print(f"\n📝 {category}:")
-        for i, query in enumerate(query_list, 1):
-            print(f"   {i}. {query}")
-    
-    print("\n💡 These queries test:")
-    print("   ✓ Company-specific information retrieval")
-    print("   ✓ Geographic filtering")
-    print("   ✓ Sector analysis")
-    print("   ✓ Temporal queries")
-    print("   ✓ Investor matching")
-    print("   ✓ Multi-field complex queries")
-    print("   ✓ Multilingual support (8 languages)")
+        lines.append(f"\n📝 {category}:")
+        lines.extend(f"   {i}. {query}" for i, query in enumerate(query_list, 1))
+    
+    lines += [
+        "\n💡 These queries test:",
+        "   ✓ Company-specific information retrieval",
+        "   ✓ Geographic filtering",
+        "   ✓ Sector analysis",
+        "   ✓ Temporal queries",
+        "   ✓ Investor matching",
+        "   ✓ Multi-field complex queries",
+        "   ✓ Multilingual support (8 languages)",
+    ]
+    print("\n".join(lines))
 
 if __name__ == "__main__":
     try:
@@ -5,13 +5,18 @@ Creates realistic funding data based on actual Indian startup ecosystem trends
 
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-import random
+from datetime import datetime
+import codecs
 import json
 
-# Set random seed for reproducibility
-np.random.seed(42)
-random.seed(42)
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:  # optional - pandas writes the same CSV, just slower
+    pa = None
+
+# Set random seed for reproducibility - every helper draws from this generator in batches
+rng = np.random.default_rng(42)
 
 # ==================== DATA CONFIGURATION ====================
 
@@ -156,17 +161,146 @@ USD_TO_INR = {
 }
 
 
-def generate_random_date(year):
-    """Generate random date within a year"""
-    start = datetime(year, 1, 1)
-    end = datetime(year, 12, 31)
-    delta = end - start
-    random_days = random.randint(0, delta.days)
-    return start + timedelta(days=random_days)
+# Output columns and their array dtypes; low-cardinality text becomes categorical
+COLUMN_DTYPES = {
+    'Startup Name': object,
+    'Amount_Cleaned': object,
+    'Amount_USD': object,
+    'Amount_INR_Numeric': np.float64,
+    'Sector_Standardized': object,
+    'City': object,
+    'State_Standardized': object,
+    'Investors\' Name': object,
+    'Funding_Stage': object,
+    'Date_Parsed': object,
+    'Year': np.int16,
+    'Quarter': object,
+    'Month': object
+}
+CATEGORICAL_COLUMNS = {
+    'Startup Name', 'Sector_Standardized', 'City', 'State_Standardized', 'Funding_Stage', 'Quarter', 'Month'
+}
+
+# All investors in one array; each category is a contiguous block
+INVESTOR_POOL = np.array([name for names in INVESTORS.values() for name in names], dtype=object)
+INVESTOR_BLOCK_SIZE = np.array([len(names) for names in INVESTORS.values()])
+INVESTOR_BLOCK_START = np.concatenate([[0], np.cumsum(INVESTOR_BLOCK_SIZE)[:-1]])
+
+# Investor category mix by deal size (USD M): up to 20, 20-100, above 100
+INVESTOR_MIX_BINS = [20, 100]
+INVESTOR_MIX = [
+    # Small deals: Angels and domestic VCs
+    (['Domestic VC', 'Angel/HNI'], [0.6, 0.4]),
+    # Medium deals: Mix of VCs
+    (['Domestic VC', 'Foreign VC', 'Corporate VC'], [0.5, 0.35, 0.15]),
+    # Large deals: More foreign VCs and PE
+    (['Foreign VC', 'PE Funds', 'Domestic VC'], [0.5, 0.3, 0.2]),
+]
+
+# Investors per deal by deal size (USD M): up to 10, 10-50, 50-100, above 100
+INVESTOR_COUNT_BINS = [10, 50, 100]
+INVESTOR_COUNT_RANGE = np.array([(1, 1), (1, 2), (1, 3), (2, 5)])
+MAX_INVESTORS = int(INVESTOR_COUNT_RANGE[:, 1].max())
+
+MONTH_NAMES = np.array([
+    'January', 'February', 'March', 'April', 'May', 'June',
+    'July', 'August', 'September', 'October', 'November', 'December'
+], dtype=object)
+QUARTER_LABELS = np.array(['Q1', 'Q2', 'Q3', 'Q4'], dtype=object)
+
+# Era strings parsed once into integer year ranges
+ERA_RANGES = {tuple(map(int, era.split('-'))): companies for era, companies in STARTUPS.items()}
+SECTOR_ERAS = {
+    sector: (*map(int, era_range.split('-')), weight)
+    for sector, (era_range, weight) in SECTORS.items()
+}
+
+# Sector multipliers applied to funding amounts
+SECTOR_MULTIPLIERS = {
+    'E-Commerce': 1.5,
+    'Fintech': 1.3,
+    'Mobility': 1.4,
+    'Logistics': 1.2,
+    'Edtech': 1.0,
+    'Healthtech': 0.9,
+    'Foodtech': 1.1,
+    'SaaS': 0.8,
+    'Agritech': 0.7,
+    'Gaming': 0.9,
+    'Social Media': 1.2,
+    'Deeptech': 0.8
+}
+
+# Stage choices by company age in years (the last entry covers 4+)
+STAGE_PROGRESSION = {
+    0: (['Seed', 'Pre-Series A'], [0.7, 0.3]),
+    1: (['Pre-Series A', 'Series A', 'Bridge'], [0.3, 0.6, 0.1]),
+    2: (['Series A', 'Series B', 'Bridge'], [0.3, 0.6, 0.1]),
+    3: (['Series B', 'Series C', 'Debt'], [0.3, 0.5, 0.2]),
+    4: (['Series C', 'Series D', 'Series E+', 'Growth', 'Debt'], [0.25, 0.25, 0.2, 0.2, 0.1]),
+}
+
+
+# Per-stage bounds as arrays indexed by position in FUNDING_STAGES
+STAGE_NAMES = pd.Index(list(FUNDING_STAGES))
+STAGE_MIN = np.array([bounds[0] for bounds in FUNDING_STAGES.values()])
+STAGE_MAX = np.array([bounds[1] for bounds in FUNDING_STAGES.values()])
+STAGE_LOG_MEAN = np.log((STAGE_MIN + STAGE_MAX) / 2)
+
+
+def build_year_sector_table():
+    """Available sectors and normalized weights for each year, built once at import"""
+    table = {}
+    for year in range(2010, 2026):
+        available_sectors = []
+        weights = []
+        
+        for sector, (start_year, end_year, weight) in SECTOR_ERAS.items():
+            if start_year <= year <= end_year:
+                available_sectors.append(sector)
+                weights.append(weight)
+        
+        weights = np.array(weights)
+        table[year] = (np.array(available_sectors, dtype=object), weights / weights.sum())
+    return table
+
+
+def build_company_era_start():
+    """Start year of the first era each company is listed in"""
+    era_starts = {}
+    for (era_start, _), companies in ERA_RANGES.items():
+        for company in companies:
+            era_starts.setdefault(company, era_start)
+    return era_starts
+
+
+def build_year_companies():
+    """Companies that can raise funds in each year, as object arrays"""
+    year_companies = {}
+    for year in range(2010, 2026):
+        available_companies = []
+        for (era_start, era_end), companies in ERA_RANGES.items():
+            if era_start <= year <= era_end + 3:  # Companies can raise funds 3 years after era
+                available_companies.extend(companies)
+        year_companies[year] = np.array(available_companies, dtype=object)
+    return year_companies
+
+
+YEAR_SECTOR_TABLE = build_year_sector_table()
+COMPANY_ERA_START = build_company_era_start()
+YEAR_COMPANIES = build_year_companies()
+
 
+def generate_random_date(year, size):
+    """Generate random dates within a year as datetime64[D]"""
+    start = np.datetime64(f'{year}-01-01', 'D')
+    days_in_year = (np.datetime64(f'{year + 1}-01-01', 'D') - start).astype(np.int64)
+    random_days = rng.integers(0, days_in_year, size=size)
+    return start + random_days.astype('timedelta64[D]')
 
-def select_city_by_year(year):
-    """Select city based on startup ecosystem maturity"""
+
+def select_city_by_year(year, size):
+    """Select cities (and their states) based on startup ecosystem maturity"""
     if year <= 2014:
         # Early years: 90% Tier 1 cities
         tier_prob = [0.90, 0.08, 0.02]
@@ -177,125 +311,83 @@ def select_city_by_year(year):
         # Mature phase: More distribution
         tier_prob = [0.60, 0.30, 0.10]
     
-    tier = np.random.choice(['Tier 1', 'Tier 2', 'Tier 3'], p=tier_prob)
-    city = random.choice(CITIES[tier])
-    return city, STATE_MAP[city]
+    tiers = rng.choice(3, size=size, p=tier_prob)
+    cities = np.empty(size, dtype=object)
+    for tier, tier_cities in enumerate(CITIES.values()):
+        # Cities within a tier are equally likely
+        in_tier = tiers == tier
+        cities[in_tier] = np.array(tier_cities, dtype=object)[rng.integers(0, len(tier_cities), size=in_tier.sum())]
+    
+    states = pd.Series(cities).map(STATE_MAP).to_numpy()
+    return cities, states
 
 
-def select_sector_by_year(year):
-    """Select sector based on era trends"""
-    available_sectors = []
-    weights = []
-    
-    for sector, (era_range, weight) in SECTORS.items():
-        start_year, end_year = map(int, era_range.split('-'))
-        if start_year <= year <= end_year:
-            available_sectors.append(sector)
-            weights.append(weight)
-    
-    # Normalize weights
-    total = sum(weights)
-    weights = [w/total for w in weights]
-    
-    return np.random.choice(available_sectors, p=weights)
+def select_sector_by_year(year, size):
+    """Select sectors based on era trends"""
+    available_sectors, weights = YEAR_SECTOR_TABLE[year]
+    return rng.choice(available_sectors, size=size, p=weights)
 
 
 def select_investors(year, funding_amount_usd):
-    """Select investors based on deal size and era"""
-    num_investors = 1
+    """Select investors for each deal based on deal size"""
+    funding_amount_usd = np.asarray(funding_amount_usd)
+    size = len(funding_amount_usd)
     
     # Larger deals have more investors
-    if funding_amount_usd > 100:
-        num_investors = random.randint(2, 5)
-    elif funding_amount_usd > 50:
-        num_investors = random.randint(1, 3)
-    elif funding_amount_usd > 10:
-        num_investors = random.randint(1, 2)
-    
-    # Select investor categories based on year and amount
-    investor_list = []
-    
-    for _ in range(num_investors):
-        if funding_amount_usd > 100:
-            # Large deals: More foreign VCs and PE
-            categories = ['Foreign VC', 'PE Funds', 'Domestic VC']
-            weights = [0.5, 0.3, 0.2]
-        elif funding_amount_usd > 20:
-            # Medium deals: Mix of VCs
-            categories = ['Domestic VC', 'Foreign VC', 'Corporate VC']
-            weights = [0.5, 0.35, 0.15]
-        else:
-            # Small deals: Angels and domestic VCs
-            categories = ['Domestic VC', 'Angel/HNI']
-            weights = [0.6, 0.4]
-        
-        category = np.random.choice(categories, p=weights)
-        investor = random.choice(INVESTORS[category])
-        
-        if investor not in investor_list:
-            investor_list.append(investor)
-    
-    return ', '.join(investor_list)
-
-
-def select_funding_stage(year, company_name, previous_stages):
-    """Select funding stage based on company maturity"""
-    # Determine company age (approximate)
-    company_start_year = year
-    
-    # Check which era the company belongs to
-    for era, companies in STARTUPS.items():
-        if company_name in companies:
-            era_start = int(era.split('-')[0])
-            company_start_year = max(era_start, year - random.randint(0, 3))
-            break
-    
-    company_age = year - company_start_year
-    
-    # Stage progression
-    if company_age == 0:
-        stages = ['Seed', 'Pre-Series A']
-        weights = [0.7, 0.3]
-    elif company_age == 1:
-        stages = ['Pre-Series A', 'Series A', 'Bridge']
-        weights = [0.3, 0.6, 0.1]
-    elif company_age == 2:
-        stages = ['Series A', 'Series B', 'Bridge']
-        weights = [0.3, 0.6, 0.1]
-    elif company_age == 3:
-        stages = ['Series B', 'Series C', 'Debt']
-        weights = [0.3, 0.5, 0.2]
-    elif company_age >= 4:
-        stages = ['Series C', 'Series D', 'Series E+', 'Growth', 'Debt']
-        weights = [0.25, 0.25, 0.2, 0.2, 0.1]
-    else:
-        stages = ['Seed']
-        weights = [1.0]
-    
-    return np.random.choice(stages, p=weights)
-
-
-def generate_funding_amount(year, stage, sector):
-    """Generate realistic funding amount"""
-    min_amount, max_amount = FUNDING_STAGES[stage]
-    
-    # Sector multipliers
-    sector_multipliers = {
-        'E-Commerce': 1.5,
-        'Fintech': 1.3,
-        'Mobility': 1.4,
-        'Logistics': 1.2,
-        'Edtech': 1.0,
-        'Healthtech': 0.9,
-        'Foodtech': 1.1,
-        'SaaS': 0.8,
-        'Agritech': 0.7,
-        'Gaming': 0.9,
-        'Social Media': 1.2,
-        'Deeptech': 0.8
-    }
-    
-    multiplier = sector_multipliers.get(sector, 1.0)
+    low, high = INVESTOR_COUNT_RANGE[np.digitize(funding_amount_usd, INVESTOR_COUNT_BINS, right=True)].T
+    num_investors = rng.integers(low, high + 1)
+    
+    # Draw MAX_INVESTORS candidate categories per deal, one batch per deal-size band
+    categories = np.empty((size, MAX_INVESTORS), dtype=np.int64)
+    band = np.digitize(funding_amount_usd, INVESTOR_MIX_BINS, right=True)
+    category_index = {category: i for i, category in enumerate(INVESTORS)}
+    for b, (band_categories, weights) in enumerate(INVESTOR_MIX):
+        in_band = band == b
+        codes = np.array([category_index[c] for c in band_categories])
+        categories[in_band] = rng.choice(codes, size=(in_band.sum(), MAX_INVESTORS), p=weights)
+    
+    # The k-th time a category comes up in a deal it takes the k-th investor of a
+    # random per-deal ordering of that category, so a deal never repeats an investor
+    occurrence = np.zeros((size, MAX_INVESTORS), dtype=np.int64)
+    for slot in range(1, MAX_INVESTORS):
+        occurrence[:, slot] = (categories[:, :slot] == categories[:, slot:slot + 1]).sum(axis=1)
+    
+    # Only the first num_investors slots of each deal are used
+    used = np.arange(MAX_INVESTORS) < num_investors[:, None]
+    offsets = np.zeros((size, MAX_INVESTORS), dtype=np.int64)
+    for category, block_size in enumerate(INVESTOR_BLOCK_SIZE):
+        drawn = (categories == category) & used
+        deals = drawn.any(axis=1)
+        if deals.any():
+            order = np.argsort(rng.random((deals.sum(), block_size)), axis=1)
+            offsets[drawn] = order[(np.cumsum(deals) - 1)[np.nonzero(drawn)[0]], occurrence[drawn]]
+    names = INVESTOR_POOL[INVESTOR_BLOCK_START[categories] + offsets]
+    
+    # Keep the first num_investors draws per deal
+    return [', '.join(row[:n]) for row, n in zip(names, num_investors)]
+
+
+def select_funding_stage(year, company_names):
+    """Select funding stages based on company maturity"""
+    # Determine company age (approximate); unknown companies start this year
+    size = len(company_names)
+    era_start = pd.Series(company_names).map(COMPANY_ERA_START).fillna(year).to_numpy(dtype=np.int64)
+    company_start_year = np.maximum(era_start, year - rng.integers(0, 4, size=size))
+    company_age = np.minimum(year - company_start_year, 4)
+    
+    # Stage progression, one batch draw per age group
+    stages = np.full(size, 'Seed', dtype=object)
+    for age, (choices, weights) in STAGE_PROGRESSION.items():
+        at_age = company_age == age
+        stages[at_age] = rng.choice(np.array(choices, dtype=object), size=at_age.sum(), p=weights)
+    
+    return stages
+
+
+def generate_funding_amount(year, stages, sectors):
+    """Generate realistic funding amounts"""
+    stage_idx = STAGE_NAMES.get_indexer(stages)
+    multiplier = pd.Series(sectors).map(SECTOR_MULTIPLIERS).fillna(1.0).to_numpy()
     
     # Year-based adjustment (funding bubble 2021, correction 2022-23)
     if year >= 2020 and year <= 2021:
@@ -305,31 +397,37 @@ def generate_funding_amount(year, stage, sector):
     else:
         year_mult = 1.0
     
-    # Generate amount with log-normal distribution
-    mean = (min_amount + max_amount) / 2
-    std = (max_amount - min_amount) / 4
-    
-    amount_usd = np.random.lognormal(np.log(mean), 0.5) * multiplier * year_mult
-    amount_usd = np.clip(amount_usd, min_amount, max_amount * 2)  # Allow some outliers
+    # Generate amount with log-normal distribution around the stage midpoint,
+    # working in place on one buffer instead of allocating a temporary per step
+    amount_usd = rng.standard_normal(len(stage_idx))
+    amount_usd *= 0.5
+    amount_usd += STAGE_LOG_MEAN[stage_idx]
+    np.exp(amount_usd, out=amount_usd)
+    amount_usd *= multiplier
+    amount_usd *= year_mult
+    np.clip(amount_usd, STAGE_MIN[stage_idx], STAGE_MAX[stage_idx] * 2, out=amount_usd)  # Allow some outliers
     
     # Convert to INR - USD values are in millions, so multiply by 1,000,000 first
-    amount_inr = amount_usd * 1_000_000 * USD_TO_INR[year]
+    amount_inr = amount_usd * 1_000_000
+    amount_inr *= USD_TO_INR[year]
     
     return amount_usd, amount_inr
 
 
 def format_amount(amount_inr):
-    """Format amount in Indian currency style"""
-    if amount_inr >= 10000000:  # 1 Cr+
-        crores = amount_inr / 10000000
-        return f"₹{crores:.2f} Cr"
-    elif amount_inr >= 100000:  # 1 L+
-        lakhs = amount_inr / 100000
-        return f"₹{lakhs:.2f} L"
-    else:
-        # For very small amounts, still show in Lakhs
-        lakhs = amount_inr / 100000
-        return f"₹{lakhs:.3f} L"
+    """Format amounts in Indian currency style, one vectorized pass per unit"""
+    amount_inr = np.asarray(amount_inr, dtype=np.float64)
+    formatted = np.empty(amount_inr.shape, dtype=object)
+    
+    crores = amount_inr >= 10000000  # 1 Cr+
+    lakhs = ~crores & (amount_inr >= 100000)  # 1 L+
+    small = ~(crores | lakhs)
+    
+    formatted[crores] = np.char.mod("₹%.2f Cr", amount_inr[crores] / 10000000)
+    formatted[lakhs] = np.char.mod("₹%.2f L", amount_inr[lakhs] / 100000)
+    # For very small amounts, still show in Lakhs
+    formatted[small] = np.char.mod("₹%.3f L", amount_inr[small] / 100000)
+    return formatted
 
 
 def generate_dataset(target_records=15000):
@@ -339,73 +437,65 @@ def generate_dataset(target_records=15000):
     print(f"📊 Target: {target_records} funding records (2010-2025)")
     print("=" * 70)
     
-    records = []
-    company_funding_history = {}  # Track funding stages per company
+    records_per_year = {
+        year: int((target_records / 16) * year_intensity)  # 16 years
+        for year, year_intensity in YEAR_INTENSITY.items()
+    }
+    total_records = sum(records_per_year.values())
+    
+    # Preallocated column arrays, filled one year-slice at a time
+    columns = {name: np.empty(total_records, dtype=dtype) for name, dtype in COLUMN_DTYPES.items()}
     company_sector_mapping = {}  # Track consistent sector per company
+    offset = 0
     
-    for year in range(2010, 2026):
-        year_intensity = YEAR_INTENSITY[year]
-        num_records_year = int((target_records / 16) * year_intensity)  # 16 years
-        
+    for year, num_records_year in records_per_year.items():
         print(f"\n📅 Generating {num_records_year} records for {year}...")
         
-        # Select companies for this year
-        available_companies = []
-        for era, companies in STARTUPS.items():
-            era_start, era_end = map(int, era.split('-'))
-            if era_start <= year <= era_end + 3:  # Companies can raise funds 3 years after era
-                available_companies.extend(companies)
+        # Draw the whole year in batches instead of record by record
+        available_companies = YEAR_COMPANIES[year]
+        company_names = available_companies[rng.integers(0, len(available_companies), size=num_records_year)]
+        dates = generate_random_date(year, num_records_year)
+        months = dates.astype('datetime64[M]').astype(np.int64) % 12  # 0 = January
+        
+        # Use consistent sector for each company - new companies get one from this year's trends
+        new_companies = [c for c in pd.unique(company_names) if c not in company_sector_mapping]
+        company_sector_mapping.update(zip(new_companies, select_sector_by_year(year, len(new_companies))))
+        sectors = pd.Series(company_names).map(company_sector_mapping).to_numpy()
+        
+        cities, states = select_city_by_year(year, num_records_year)
+        stages = select_funding_stage(year, company_names)
+        amount_usd, amount_inr = generate_funding_amount(year, stages, sectors)
+        investors = select_investors(year, amount_usd)
         
-        for i in range(num_records_year):
-            company_name = random.choice(available_companies)
-            
-            # Get previous stages for this company
-            previous_stages = company_funding_history.get(company_name, [])
-            
-            # Generate funding details
-            date = generate_random_date(year)
-            
-            # Use consistent sector for each company
-            if company_name not in company_sector_mapping:
-                company_sector_mapping[company_name] = select_sector_by_year(year)
-            sector = company_sector_mapping[company_name]
-            
-            city, state = select_city_by_year(year)
-            stage = select_funding_stage(year, company_name, previous_stages)
-            amount_usd, amount_inr = generate_funding_amount(year, stage, sector)
-            investors = select_investors(year, amount_usd)
-            amount_formatted = format_amount(amount_inr)
-            
-            # Update company history
-            if company_name not in company_funding_history:
-                company_funding_history[company_name] = []
-            company_funding_history[company_name].append(stage)
-            
-            record = {
-                'Startup Name': company_name,
-                'Amount_Cleaned': amount_formatted,
-                'Amount_USD': f"${amount_usd:.2f}M",
-                'Amount_INR_Numeric': amount_inr,
-                'Sector_Standardized': sector,
-                'City': city,
-                'State_Standardized': state,
-                'Investors\' Name': investors,
-                'Funding_Stage': stage,
-                'Date_Parsed': date.strftime('%Y-%m-%d'),
-                'Year': year,
-                'Quarter': f"Q{(date.month-1)//3 + 1}",
-                'Month': date.strftime('%B')
-            }
-            
-            records.append(record)
+        year_columns = {
+            'Startup Name': company_names,
+            'Amount_Cleaned': format_amount(amount_inr),
+            'Amount_USD': np.char.mod("$%.2fM", amount_usd),
+            'Amount_INR_Numeric': amount_inr,
+            'Sector_Standardized': sectors,
+            'City': cities,
+            'State_Standardized': states,
+            'Investors\' Name': investors,
+            'Funding_Stage': stages,
+            'Date_Parsed': dates.astype(str),
+            'Year': year,
+            'Quarter': QUARTER_LABELS[months // 3],
+            'Month': MONTH_NAMES[months]
+        }
+        for name, values in year_columns.items():
+            columns[name][offset:offset + num_records_year] = values
         
-        print(f"   ✅ Generated {num_records_year} records | Total: {len(records)}")
+        offset += num_records_year
+        print(f"   ✅ Generated {num_records_year} records | Total: {offset}")
     
-    # Create DataFrame
-    df = pd.DataFrame(records)
+    # Shuffle to mix years - permute the column arrays so the DataFrame is built once, already shuffled
+    perm = rng.permutation(total_records)
     
-    # Shuffle to mix years
-    df = df.sample(frac=1, random_state=42).reset_index(drop=True)
+    # Create DataFrame in one go from the column arrays
+    df = pd.DataFrame({
+        name: pd.Categorical(values[perm]) if name in CATEGORICAL_COLUMNS else values[perm]
+        for name, values in columns.items()
+    }, copy=False)
     
     print("\n" + "=" * 70)
     print(f"✨ Dataset Generation Complete!")
@@ -428,12 +518,11 @@ def generate_statistics(df):
     
     # Year-wise breakdown
     print("\n📅 Year-wise Funding:")
-    year_stats = df.groupby('Year').agg({
-        'Startup Name': 'count',
-        'Amount_INR_Numeric': 'sum'
-    }).rename(columns={'Startup Name': 'Deals', 'Amount_INR_Numeric': 'Amount_INR'})
-    year_stats['Amount_Cr'] = year_stats['Amount_INR'] / 10000000
-    print(year_stats[['Deals', 'Amount_Cr']].to_string())
+    year_stats = pd.DataFrame({
+        'Deals': df['Year'].value_counts().sort_index(),
+        'Amount_Cr': df.groupby('Year')['Amount_INR_Numeric'].sum() / 10000000
+    })
+    print(year_stats.to_string())
     
     # Sector-wise breakdown
     print("\n🏭 Top 10 Sectors by Deal Count:")
@@ -447,13 +536,24 @@ def generate_statistics(df):
     
     # Top funded companies
     print("\n💰 Top 15 Most Funded Companies:")
-    company_funding = df.groupby('Startup Name')['Amount_INR_Numeric'].sum().sort_values(ascending=False).head(15)
+    company_funding = df.groupby('Startup Name', observed=True)['Amount_INR_Numeric'].sum().nlargest(15)
     company_funding_cr = company_funding / 10000000
     print(company_funding_cr.to_string())
     
     print("\n" + "=" * 70)
 
 
+def write_csv(df, filename):
+    """Write a UTF-8 CSV with BOM, using Arrow's multithreaded writer when available"""
+    if pa is None:
+        df.to_csv(filename, index=False, encoding='utf-8-sig')
+        return
+    
+    with open(filename, 'wb') as f:
+        f.write(codecs.BOM_UTF8)
+        pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), f)
+
+
 def save_dataset(df, filename='cleaned_funding_synthetic_2010_2025.csv'):
     """Save dataset to CSV"""
     # Prepare final columns to match original format
@@ -463,13 +563,13 @@ def save_dataset(df, filename='cleaned_funding_synthetic_2010_2025.csv'):
         'Date_Parsed', 'Year'
     ]].copy()
     
-    final_df.to_csv(filename, index=False, encoding='utf-8-sig')
+    write_csv(final_df, filename)
     print(f"\n💾 Dataset saved to: {filename}")
     print(f"📦 File size: {len(df)} records")
     
     # Also save with extended columns
     extended_filename = filename.replace('.csv', '_extended.csv')
-    df.to_csv(extended_filename, index=False, encoding='utf-8-sig')
+    write_csv(df, extended_filename)
     print(f"💾 Extended dataset saved to: {extended_filename}")
     
     # Save metadata
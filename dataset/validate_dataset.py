@@ -1,7 +1,11 @@
+import importlib.util
 import pandas as pd
 
-# Load the dataset
-df = pd.read_csv('cleaned_funding_synthetic_2010_2025.csv')
+# Load the dataset - with pyarrow installed, use its multithreaded parser and Arrow-backed columns
+if importlib.util.find_spec('pyarrow'):
+    df = pd.read_csv('cleaned_funding_synthetic_2010_2025.csv', engine='pyarrow', dtype_backend='pyarrow')
+else:
+    df = pd.read_csv('cleaned_funding_synthetic_2010_2025.csv')
 
 print("\n📊 DATASET VALIDATION SUMMARY")
 print("=" * 70)
@@ -4,118 +4,151 @@ Configuration management for Prometheus RAG
 import os
 import sys
 import logging
-from dotenv import load_dotenv
+from env_cache import load_env
+
+__all__ = ["Config"]
 
 # Load environment variables
-load_dotenv()
+load_env()
 
-# Configure logging early
-logging.basicConfig(
-    level=os.getenv("LOG_LEVEL", "INFO"),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Configure logging early, unless the parent process or server already did
+if not logging.getLogger().handlers:
+    logging.basicConfig(
+        level=os.getenv("LOG_LEVEL", "INFO"),
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
 logger = logging.getLogger(__name__)
 
+_BAR = "=" * 60
 
-class Config:
-    """Application configuration"""
-    
+
+# Characters that start a truthy value ("true", "1", "yes")
+_TRUE_PREFIXES = frozenset("tT1yY")
+
+_CASTERS = {
+    str: str,
+    int: int,
+    bool: lambda value: value[:1] in _TRUE_PREFIXES,
+    list: lambda value: value.split(","),
+}
+
+# (attribute, type, default) - read from the environment variable of the same
+# name unless listed in _ENV_NAMES; unset or empty variables use the default
+_SCHEMA = (
     # Security
-    SECRET_KEY = os.getenv("SECRET_KEY", "change-this-in-production")
-    SESSION_EXPIRY_DAYS = int(os.getenv("SESSION_EXPIRY_DAYS", "30"))
-    
+    ("SECRET_KEY", str, "change-this-in-production"),
+    ("SESSION_EXPIRY_DAYS", int, 30),
+    # Key for admin endpoints (X-Admin-Key header); empty disables them
+    ("ADMIN_API_KEY", str, ""),
+    # bcrypt cost for password hashes: 4-31, or "auto" to calibrate at startup
+    ("BCRYPT_COST", str, "12"),
     # Database
-    DATABASE_PATH = os.getenv("DATABASE_PATH", "prometheus.db")
-    CHROMA_PATH = os.getenv("CHROMA_PATH", "chroma_db")
-    
+    ("DATABASE_PATH", str, "prometheus.db"),
+    ("CHROMA_PATH", str, "chroma_db"),
     # Ollama
-    OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
-    OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3.1:8b")
-    OLLAMA_TIMEOUT = int(os.getenv("OLLAMA_TIMEOUT", "120"))
-    
+    ("OLLAMA_BASE_URL", str, "http://localhost:11434"),
+    ("OLLAMA_MODEL", str, "llama3.1:8b"),
+    ("OLLAMA_TIMEOUT", int, 120),
     # Redis (optional caching)
-    REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
-    REDIS_PORT = int(os.getenv("REDIS_PORT", "6379"))
-    REDIS_PASSWORD = os.getenv("REDIS_PASSWORD", "")
-    REDIS_ENABLED = os.getenv("REDIS_ENABLED", "false").lower() == "true"
-    REDIS_TTL = int(os.getenv("REDIS_TTL", "3600"))
-    
+    ("REDIS_HOST", str, "localhost"),
+    ("REDIS_PORT", int, 6379),
+    ("REDIS_PASSWORD", str, ""),
+    ("REDIS_ENABLED", bool, False),
+    ("REDIS_TTL", int, 3600),
     # CORS
-    ALLOWED_ORIGINS = os.getenv("ALLOWED_ORIGINS", "http://localhost:3000,http://localhost:5173").split(",")
-    
+    ("ALLOWED_ORIGINS", list, ["http://localhost:3000", "http://localhost:5173"]),
     # Server
-    HOST = os.getenv("HOST", "0.0.0.0")
-    PORT = int(os.getenv("PORT", "8000"))
-    DEBUG = os.getenv("DEBUG", "false").lower() == "true"
-    
+    ("HOST", str, "0.0.0.0"),
+    ("PORT", int, 8000),
+    ("DEBUG", bool, False),
     # Rate Limiting
-    RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
-    LOGIN_RATE_LIMIT = os.getenv("LOGIN_RATE_LIMIT", "5/minute")
-    API_RATE_LIMIT = os.getenv("API_RATE_LIMIT", "100/minute")
-    
+    ("RATE_LIMIT_ENABLED", bool, True),
+    ("LOGIN_RATE_LIMIT", str, "5/minute"),
+    ("API_RATE_LIMIT", str, "100/minute"),
     # Dataset
-    DATASET_PATH = os.getenv("DATASET_PATH", "../../dataset/cleaned_funding_synthetic_2010_2025.csv")
-    
+    ("DATASET_PATH", str, "../../dataset/cleaned_funding_synthetic_2010_2025.csv"),
+    # Parquet copy of the dataset (defaults to the CSV path with a .parquet suffix)
+    ("DATASET_PARQUET_PATH", str, ""),
     # Whisper STT
-    WHISPER_MODEL_SIZE = os.getenv("WHISPER_MODEL_SIZE", "large-v3")
-    WHISPER_DEVICE = os.getenv("WHISPER_DEVICE", "cpu")
-    WHISPER_COMPUTE_TYPE = os.getenv("WHISPER_COMPUTE_TYPE", "int8")
-    
+    ("WHISPER_MODEL_SIZE", str, "large-v3"),
+    ("WHISPER_DEVICE", str, "cpu"),
+    ("WHISPER_COMPUTE_TYPE", str, "int8"),
     # Logging
-    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
-    
+    ("LOG_LEVEL", str, "INFO"),
     # Email (optional)
-    SMTP_HOST = os.getenv("SMTP_HOST", "")
-    SMTP_PORT = int(os.getenv("SMTP_PORT", "587")) if os.getenv("SMTP_PORT") else 587
-    SMTP_USERNAME = os.getenv("SMTP_USERNAME", "")
-    SMTP_PASSWORD = os.getenv("SMTP_PASSWORD", "")
-    SMTP_FROM_EMAIL = os.getenv("SMTP_FROM_EMAIL", "noreply@prometheus.ai")
-    
+    ("SMTP_HOST", str, ""),
+    ("SMTP_PORT", int, 587),
+    ("SMTP_USERNAME", str, ""),
+    ("SMTP_PASSWORD", str, ""),
+    ("SMTP_FROM_EMAIL", str, "noreply@prometheus.ai"),
     # Analytics
-    ANALYTICS_RETENTION_DAYS = int(os.getenv("ANALYTICS_RETENTION_DAYS", "90"))
-    
+    ("ANALYTICS_RETENTION_DAYS", int, 90),
     # Performance
-    MAX_RESULTS_LIMIT = int(os.getenv("MAX_RESULTS_LIMIT", "100"))
-    CHROMA_BATCH_SIZE = int(os.getenv("CHROMA_BATCH_SIZE", "10"))
-    
+    ("MAX_RESULTS_LIMIT", int, 100),
+    ("CHROMA_BATCH_SIZE", int, 10),
     # Translation
-    TRANSLATION_CACHE_ENABLED = os.getenv("TRANSLATION_CACHE_ENABLED", "true").lower() == "true"
-    TRANSLATION_CACHE_FILE = os.getenv("TRANSLATION_CACHE_FILE", "translation_cache.json")
-    
+    ("TRANSLATION_CACHE_ENABLED", bool, True),
+    ("TRANSLATION_CACHE_FILE", str, "translation_cache.json"),
     # Query expansion
-    QUERY_EXPANSION_ENABLED = os.getenv("QUERY_EXPANSION_ENABLED", "true").lower() == "true"
-    
+    ("QUERY_EXPANSION_ENABLED", bool, True),
     # Reranker
-    RERANKER_MODEL = os.getenv("RERANKER_MODEL", "cross-encoder/ms-marco-MiniLM-L-6-v2")
+    ("RERANKER_MODEL", str, "cross-encoder/ms-marco-MiniLM-L-6-v2"),
+)
+
+# Attributes whose environment variable has a different name
+_ENV_NAMES = {"DATASET_PARQUET_PATH": "FUNDING_PARQUET"}
+
+_FIELDS = {name: (typ, default) for name, typ, default in _SCHEMA}
+
+
+class _ConfigMeta(type):
+    """Resolves _SCHEMA fields from the environment on first access"""
+
+    def __getattr__(cls, name):
+        try:
+            typ, default = _FIELDS[name]
+        except KeyError:
+            raise AttributeError(f"type object '{cls.__name__}' has no attribute '{name}'") from None
+        raw = os.environ.get(_ENV_NAMES.get(name, name))
+        try:
+            value = _CASTERS[typ](raw) if raw else default
+        except ValueError:
+            raise ValueError(f"{name}={raw!r} is not a valid {typ.__name__}") from None
+        # Cache on the class so later lookups never reach __getattr__
+        setattr(cls, name, value)
+        return value
+
+
+class Config(metaclass=_ConfigMeta):
+    """Application configuration (attributes are resolved lazily from _SCHEMA)"""
     
     @classmethod
     def validate(cls):
-        """Validate critical configuration"""
-        errors = []
-        warnings = []
-        
-        # Critical validations
-        if cls.SECRET_KEY == "change-this-in-production" and not cls.DEBUG:
-            errors.append("SECRET_KEY must be set in production!")
+        """Validate configuration with ConfigValidator, checking the already-cast attributes"""
+        from config_validator import ConfigValidator, _VALIDATED_KEYS
         
-        if len(cls.SECRET_KEY) < 32 and not cls.DEBUG:
-            warnings.append("SECRET_KEY should be at least 32 characters for security")
-        
-        if cls.PORT < 1 or cls.PORT > 65535:
-            errors.append(f"PORT {cls.PORT} is invalid (must be 1-65535)")
+        # Resolve every field so a value that fails to cast is reported here,
+        # not on its first use while serving (the validator reports its own keys)
+        errors = []
+        for name in _FIELDS:
+            try:
+                getattr(cls, name)
+            except ValueError as e:
+                if name not in _VALIDATED_KEYS:
+                    errors.append(str(e))
         
-        if cls.SESSION_EXPIRY_DAYS < 1:
-            errors.append("SESSION_EXPIRY_DAYS must be at least 1")
+        _, validator_errors, warnings = ConfigValidator().validate_all(cls)
+        errors.extend(validator_errors)
         
         # Log warnings
         for warning in warnings:
-            logger.warning(f"⚠️  {warning}")
+            logger.warning("⚠️  %s", warning)
         
         # Raise errors
         if errors:
             logger.error("Configuration validation failed:")
             for error in errors:
-                logger.error(f"❌ {error}")
+                logger.error("❌ %s", error)
             raise ValueError("Invalid configuration. Please check errors above.")
         
         logger.info("✅ Configuration validated successfully")
@@ -124,25 +157,36 @@ class Config:
     @classmethod
     def print_summary(cls):
         """Print configuration summary"""
-        logger.info("=" * 60)
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        logger.info(_BAR)
         logger.info("Prometheus Configuration Summary")
-        logger.info("=" * 60)
-        logger.info(f"Debug Mode: {cls.DEBUG}")
-        logger.info(f"Server: {cls.HOST}:{cls.PORT}")
-        logger.info(f"Database: {cls.DATABASE_PATH}")
-        logger.info(f"ChromaDB: {cls.CHROMA_PATH}")
-        logger.info(f"Ollama: {cls.OLLAMA_BASE_URL} ({cls.OLLAMA_MODEL})")
-        logger.info(f"Redis Caching: {'Enabled' if cls.REDIS_ENABLED else 'Disabled'}")
-        logger.info(f"Rate Limiting: {'Enabled' if cls.RATE_LIMIT_ENABLED else 'Disabled'}")
-        logger.info(f"Log Level: {cls.LOG_LEVEL}")
-        logger.info("=" * 60)
-
-
-# Run validation on import (but allow override for testing)
+        logger.info(_BAR)
+        logger.info("Debug Mode: %s", cls.DEBUG)
+        logger.info("Server: %s:%s", cls.HOST, cls.PORT)
+        logger.info("Database: %s", cls.DATABASE_PATH)
+        logger.info("ChromaDB: %s", cls.CHROMA_PATH)
+        logger.info("Ollama: %s (%s)", cls.OLLAMA_BASE_URL, cls.OLLAMA_MODEL)
+        logger.info("Redis Caching: %s", "Enabled" if cls.REDIS_ENABLED else "Disabled")
+        logger.info("Rate Limiting: %s", "Enabled" if cls.RATE_LIMIT_ENABLED else "Disabled")
+        logger.info("Log Level: %s", cls.LOG_LEVEL)
+        logger.info(_BAR)
+
+
+# Resolved eagerly so the production safety check below always sees it
+Config.SECRET_KEY
+
+
+# Full validation (ranges, URLs, choices) runs ahead of time via
+# tools/validate_config.py; at import only the production secret key is checked
 if os.getenv("SKIP_CONFIG_VALIDATION", "false").lower() != "true":
-    try:
-        Config.validate()
-    except ValueError as e:
-        logger.error(f"Configuration validation failed: {e}")
-        if not Config.DEBUG:
-            sys.exit(1)
+    if os.getenv("PROMETHEUS_RUNTIME_VALIDATE") == "1":
+        try:
+            Config.validate()
+        except ValueError as e:
+            logger.error("Configuration validation failed: %s", e)
+            if not Config.DEBUG:
+                sys.exit(1)
+    elif Config.SECRET_KEY == "change-this-in-production" and not Config.DEBUG:
+        logger.error("❌ SECRET_KEY must be set in production!")
+        sys.exit(1)
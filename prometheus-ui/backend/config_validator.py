@@ -3,53 +3,123 @@ Environment configuration validator for Prometheus
 Ensures all required variables are set and valid before startup
 """
 import os
-import sys
+import re
 import logging
-from typing import List, Tuple, Optional
-from urllib.parse import urlparse
+from functools import lru_cache
+from typing import AbstractSet, Any, Dict, List, Tuple, Optional, Union
 
 logger = logging.getLogger(__name__)
 
+_BAR = "=" * 60
+
+_BOOL_VALUES = frozenset({"true", "false", "1", "0", "yes", "no"})
+
+# Same boolean rule as Config: values starting with these count as true
+_TRUE_PREFIXES = frozenset("tT1yY")
+
+# scheme://netloc - the common case, checked without running urlparse
+_URL_RE = re.compile(r"^[a-zA-Z][a-zA-Z0-9+.\-]*://[^/\s]+")
+
+_WHISPER_SIZES = frozenset({"tiny", "base", "small", "medium", "large", "large-v2", "large-v3"})
+_WHISPER_DEVICES = frozenset({"cpu", "cuda"})
+_WHISPER_COMPUTE_TYPES = frozenset({"int8", "float16", "float32"})
+_LOG_LEVELS = frozenset({"DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"})
+
+# (env var, allowed values) pairs checked by validate_all
+_CHECKS = (
+    ("WHISPER_MODEL_SIZE", _WHISPER_SIZES),
+    ("WHISPER_DEVICE", _WHISPER_DEVICES),
+    ("WHISPER_COMPUTE_TYPE", _WHISPER_COMPUTE_TYPES),
+    ("LOG_LEVEL", _LOG_LEVELS),
+)
+
+# Every env var validate_all reads; their values key the result cache
+_VALIDATED_KEYS = (
+    "SECRET_KEY", "DEBUG", "SESSION_EXPIRY_DAYS", "BCRYPT_COST", "DATABASE_PATH", "CHROMA_PATH",
+    "OLLAMA_BASE_URL", "OLLAMA_MODEL", "REDIS_ENABLED", "REDIS_PORT", "REDIS_TTL",
+    "PORT", "RATE_LIMIT_ENABLED", "DATASET_PATH", "ANALYTICS_RETENTION_DAYS",
+    "MAX_RESULTS_LIMIT", "CHROMA_BATCH_SIZE", "SMTP_HOST", "SMTP_PORT",
+    "CELERY_BROKER_URL", "CELERY_RESULT_BACKEND",
+) + tuple(key for key, _ in _CHECKS)
+
+_VALIDATE_CACHE: Dict[Tuple[Any, ...], Tuple[Tuple[str, ...], Tuple[str, ...]]] = {}
+
+
+def _is_true(value) -> bool:
+    if isinstance(value, bool):
+        return value
+    return bool(value) and value[:1] in _TRUE_PREFIXES
+
+
+_EMPTY = ()
+
+
+@lru_cache(maxsize=64)
+def _exists(path: str) -> bool:
+    return os.path.exists(path)
+
+
+def _config_value(cfg, name: str) -> Any:
+    """Cast attribute of cfg, or the raw environment value when it is unset or fails to cast"""
+    try:
+        return getattr(cfg, name)
+    except (AttributeError, ValueError):
+        # Left raw so the validator reports the bad value instead of crashing on it
+        return os.environ.get(name)
+
 
 class ConfigValidator:
     """Validates environment configuration"""
     
     def __init__(self):
-        self.errors: List[str] = []
-        self.warnings: List[str] = []
+        # Shared empty tuple until the first message; most runs report nothing.
+        # Only _add_error/_add_warning write to these, and they swap in a list
+        self.errors: Union[List[str], Tuple[()]] = _EMPTY
+        self.warnings: Union[List[str], Tuple[()]] = _EMPTY
+    
+    def _add_error(self, message: str):
+        if self.errors is _EMPTY:
+            self.errors = []
+        self.errors.append(message)
+    
+    def _add_warning(self, message: str):
+        if self.warnings is _EMPTY:
+            self.warnings = []
+        self.warnings.append(message)
     
     def validate_required(self, key: str, env_value: Optional[str]) -> bool:
         """Validate that a required variable is set"""
         if not env_value:
-            self.errors.append(f"Required environment variable '{key}' is not set")
+            self._add_error(f"Required environment variable '{key}' is not set")
             return False
         return True
     
     def validate_integer(self, key: str, env_value: Optional[str], min_val: Optional[int] = None, max_val: Optional[int] = None) -> bool:
         """Validate integer value with optional range"""
-        if not env_value:
+        if env_value is None or env_value == "":
             return True  # Skip if not set
         
         try:
-            value = int(env_value)
+            # Values taken from Config are already cast
+            value = env_value if isinstance(env_value, int) else int(env_value)
             if min_val is not None and value < min_val:
-                self.errors.append(f"{key}={value} is below minimum {min_val}")
+                self._add_error(f"{key}={value} is below minimum {min_val}")
                 return False
             if max_val is not None and value > max_val:
-                self.errors.append(f"{key}={value} is above maximum {max_val}")
+                self._add_error(f"{key}={value} is above maximum {max_val}")
                 return False
             return True
         except ValueError:
-            self.errors.append(f"{key}='{env_value}' is not a valid integer")
+            self._add_error(f"{key}='{env_value}' is not a valid integer")
             return False
     
     def validate_boolean(self, key: str, env_value: Optional[str]) -> bool:
         """Validate boolean value"""
-        if not env_value:
+        if not env_value or isinstance(env_value, bool):
             return True
         
-        if env_value.lower() not in ['true', 'false', '1', '0', 'yes', 'no']:
-            self.errors.append(f"{key}='{env_value}' is not a valid boolean (use: true/false)")
+        if env_value.lower() not in _BOOL_VALUES:
+            self._add_error(f"{key}='{env_value}' is not a valid boolean (use: true/false)")
             return False
         return True
     
@@ -57,15 +127,18 @@ class ConfigValidator:
         """Validate URL format"""
         if not env_value:
             return True
+        if _URL_RE.match(env_value):
+            return True
         
+        from urllib.parse import urlparse
         try:
             result = urlparse(env_value)
             if not all([result.scheme, result.netloc]):
-                self.errors.append(f"{key}='{env_value}' is not a valid URL")
+                self._add_error(f"{key}='{env_value}' is not a valid URL")
                 return False
             return True
         except Exception:
-            self.errors.append(f"{key}='{env_value}' is not a valid URL")
+            self._add_error(f"{key}='{env_value}' is not a valid URL")
             return False
     
     def validate_file_path(self, key: str, env_value: Optional[str], must_exist: bool = False) -> bool:
@@ -73,145 +146,151 @@ class ConfigValidator:
         if not env_value:
             return True
         
-        if must_exist and not os.path.exists(env_value):
-            self.warnings.append(f"{key}='{env_value}' - file does not exist yet")
+        if must_exist and not _exists(env_value):
+            self._add_warning(f"{key}='{env_value}' - file does not exist yet")
         return True
     
-    def validate_choice(self, key: str, env_value: Optional[str], choices: List[str]) -> bool:
+    def validate_choice(self, key: str, env_value: Optional[str], choices: AbstractSet[str]) -> bool:
         """Validate value is one of allowed choices"""
         if not env_value:
             return True
         
         if env_value not in choices:
-            self.errors.append(f"{key}='{env_value}' must be one of: {', '.join(choices)}")
+            self._add_error(f"{key}='{env_value}' must be one of: {', '.join(sorted(choices))}")
             return False
         return True
     
     def validate_secret_key(self, key: str, env_value: Optional[str], is_production: bool) -> bool:
         """Validate secret key strength"""
         if not env_value:
-            self.errors.append(f"Required environment variable '{key}' is not set")
+            self._add_error(f"Required environment variable '{key}' is not set")
             return False
         
         if env_value == "change-this-in-production" or env_value == "change-this-in-production-use-openssl-rand-hex-32":
             if is_production:
-                self.errors.append(f"{key} must be changed from default in production!")
+                self._add_error(f"{key} must be changed from default in production!")
                 return False
             else:
-                self.warnings.append(f"{key} is using default value - change for production")
+                self._add_warning(f"{key} is using default value - change for production")
         
         if len(env_value) < 32:
-            self.warnings.append(f"{key} should be at least 32 characters for security")
+            self._add_warning(f"{key} should be at least 32 characters for security")
         
         return True
     
-    def validate_all(self) -> Tuple[bool, List[str], List[str]]:
-        """Run all validations"""
-        self.errors = []
-        self.warnings = []
+    @classmethod
+    def clear_cache(cls):
+        """Forget memoized validate_all results (e.g. after files were created)"""
+        _VALIDATE_CACHE.clear()
+        _exists.cache_clear()
+    
+    def validate_all(self, cfg=None) -> Tuple[bool, List[str], List[str]]:
+        """
+        Run all validations (memoized on the validated values)
+        
+        Args:
+            cfg: Optional Config class; its already-cast attributes are checked
+                instead of re-reading and re-parsing the same environment variables
+        """
+        # One pass over the sources; the snapshot is both the cache key and the input
+        if cfg is None:
+            env = {name: os.environ.get(name) for name in _VALIDATED_KEYS}
+        else:
+            env = {name: _config_value(cfg, name) for name in _VALIDATED_KEYS}
+        key = tuple(env.values())
+        cached = _VALIDATE_CACHE.get(key)
+        if cached is None:
+            self.errors = self.warnings = _EMPTY
+            self._run_validations(env)
+            cached = _VALIDATE_CACHE[key] = (tuple(self.errors), tuple(self.warnings))
         
+        self.errors, self.warnings = list(cached[0]), list(cached[1])
+        return not self.errors, self.errors, self.warnings
+    
+    def _run_validations(self, env: Dict[str, Any]):
+        """Run every check on an env snapshot, appending to self.errors and self.warnings"""
         # Get environment variables
-        secret_key = os.getenv("SECRET_KEY")
-        debug = os.getenv("DEBUG", "false")
-        is_production = debug.lower() != "true"
+        secret_key = env["SECRET_KEY"]
+        debug = env["DEBUG"] or "false"
+        is_production = not _is_true(debug)
         
         # Security
         self.validate_secret_key("SECRET_KEY", secret_key, is_production)
-        self.validate_integer("SESSION_EXPIRY_DAYS", os.getenv("SESSION_EXPIRY_DAYS"), min_val=1, max_val=365)
+        self.validate_integer("SESSION_EXPIRY_DAYS", env["SESSION_EXPIRY_DAYS"], min_val=1, max_val=365)
+        bcrypt_cost = env["BCRYPT_COST"]
+        if (bcrypt_cost or "").strip().lower() != "auto":
+            self.validate_integer("BCRYPT_COST", bcrypt_cost, min_val=4, max_val=31)
         
         # Database
-        self.validate_file_path("DATABASE_PATH", os.getenv("DATABASE_PATH"))
-        self.validate_file_path("CHROMA_PATH", os.getenv("CHROMA_PATH"))
+        self.validate_file_path("DATABASE_PATH", env["DATABASE_PATH"])
+        self.validate_file_path("CHROMA_PATH", env["CHROMA_PATH"])
         
         # Ollama
-        self.validate_url("OLLAMA_BASE_URL", os.getenv("OLLAMA_BASE_URL"))
-        ollama_model = os.getenv("OLLAMA_MODEL")
+        self.validate_url("OLLAMA_BASE_URL", env["OLLAMA_BASE_URL"])
+        ollama_model = env["OLLAMA_MODEL"]
         if ollama_model and len(ollama_model.strip()) == 0:
-            self.warnings.append("OLLAMA_MODEL is empty")
+            self._add_warning("OLLAMA_MODEL is empty")
         
         # Redis
-        redis_enabled = os.getenv("REDIS_ENABLED", "false")
+        redis_enabled = env["REDIS_ENABLED"] or "false"
         self.validate_boolean("REDIS_ENABLED", redis_enabled)
-        if redis_enabled.lower() == "true":
-            self.validate_integer("REDIS_PORT", os.getenv("REDIS_PORT"), min_val=1, max_val=65535)
-            self.validate_integer("REDIS_TTL", os.getenv("REDIS_TTL"), min_val=1)
+        if _is_true(redis_enabled):
+            self.validate_integer("REDIS_PORT", env["REDIS_PORT"], min_val=1, max_val=65535)
+            self.validate_integer("REDIS_TTL", env["REDIS_TTL"], min_val=1)
         
         # Server
-        self.validate_integer("PORT", os.getenv("PORT"), min_val=1, max_val=65535)
+        self.validate_integer("PORT", env["PORT"], min_val=1, max_val=65535)
         self.validate_boolean("DEBUG", debug)
         
         # Rate limiting
-        self.validate_boolean("RATE_LIMIT_ENABLED", os.getenv("RATE_LIMIT_ENABLED"))
+        self.validate_boolean("RATE_LIMIT_ENABLED", env["RATE_LIMIT_ENABLED"])
         
         # Dataset
-        dataset_path = os.getenv("DATASET_PATH")
+        dataset_path = env["DATASET_PATH"]
         if dataset_path:
             self.validate_file_path("DATASET_PATH", dataset_path, must_exist=True)
         
-        # Whisper
-        self.validate_choice(
-            "WHISPER_MODEL_SIZE",
-            os.getenv("WHISPER_MODEL_SIZE"),
-            ["tiny", "base", "small", "medium", "large", "large-v2", "large-v3"]
-        )
-        self.validate_choice(
-            "WHISPER_DEVICE",
-            os.getenv("WHISPER_DEVICE"),
-            ["cpu", "cuda"]
-        )
-        self.validate_choice(
-            "WHISPER_COMPUTE_TYPE",
-            os.getenv("WHISPER_COMPUTE_TYPE"),
-            ["int8", "float16", "float32"]
-        )
-        
-        # Logging
-        self.validate_choice(
-            "LOG_LEVEL",
-            os.getenv("LOG_LEVEL"),
-            ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
-        )
+        # Whisper and logging
+        for key, choices in _CHECKS:
+            self.validate_choice(key, env[key], choices)
         
         # Analytics
-        self.validate_integer("ANALYTICS_RETENTION_DAYS", os.getenv("ANALYTICS_RETENTION_DAYS"), min_val=1)
+        self.validate_integer("ANALYTICS_RETENTION_DAYS", env["ANALYTICS_RETENTION_DAYS"], min_val=1)
         
         # Performance
-        self.validate_integer("MAX_RESULTS_LIMIT", os.getenv("MAX_RESULTS_LIMIT"), min_val=1, max_val=1000)
-        self.validate_integer("CHROMA_BATCH_SIZE", os.getenv("CHROMA_BATCH_SIZE"), min_val=1, max_val=100)
+        self.validate_integer("MAX_RESULTS_LIMIT", env["MAX_RESULTS_LIMIT"], min_val=1, max_val=1000)
+        self.validate_integer("CHROMA_BATCH_SIZE", env["CHROMA_BATCH_SIZE"], min_val=1, max_val=100)
         
         # Email (if configured)
-        smtp_host = os.getenv("SMTP_HOST")
+        smtp_host = env["SMTP_HOST"]
         if smtp_host:
-            self.validate_integer("SMTP_PORT", os.getenv("SMTP_PORT"), min_val=1, max_val=65535)
+            self.validate_integer("SMTP_PORT", env["SMTP_PORT"], min_val=1, max_val=65535)
         
         # Celery (if configured)
-        celery_broker = os.getenv("CELERY_BROKER_URL")
+        celery_broker = env["CELERY_BROKER_URL"]
         if celery_broker:
             self.validate_url("CELERY_BROKER_URL", celery_broker)
-            self.validate_url("CELERY_RESULT_BACKEND", os.getenv("CELERY_RESULT_BACKEND"))
-        
-        is_valid = len(self.errors) == 0
-        return is_valid, self.errors, self.warnings
+            self.validate_url("CELERY_RESULT_BACKEND", env["CELERY_RESULT_BACKEND"])
     
     def print_report(self):
         """Print validation report"""
         is_valid, errors, warnings = self.validate_all()
         
         if errors:
-            logger.error("=" * 60)
+            logger.error(_BAR)
             logger.error("CONFIGURATION ERRORS DETECTED")
-            logger.error("=" * 60)
+            logger.error(_BAR)
             for error in errors:
-                logger.error(f"❌ {error}")
-            logger.error("=" * 60)
+                logger.error("❌ %s", error)
+            logger.error(_BAR)
         
-        if warnings:
-            logger.warning("=" * 60)
+        if warnings and logger.isEnabledFor(logging.WARNING):
+            logger.warning(_BAR)
             logger.warning("CONFIGURATION WARNINGS")
-            logger.warning("=" * 60)
+            logger.warning(_BAR)
             for warning in warnings:
-                logger.warning(f"⚠️  {warning}")
-            logger.warning("=" * 60)
+                logger.warning("⚠️  %s", warning)
+            logger.warning(_BAR)
         
         if is_valid and not warnings:
             logger.info("✅ All configuration validations passed")
@@ -221,6 +300,8 @@ class ConfigValidator:
 
 def validate_config() -> bool:
     """Validate configuration and exit if invalid"""
+    import sys
+    
     validator = ConfigValidator()
     is_valid = validator.print_report()
     
@@ -5,33 +5,289 @@ import sqlite3
 from datetime import datetime, timedelta
 import secrets
 from typing import Optional, Dict, List
+from collections import OrderedDict
 from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 import threading
+import asyncio
+import atexit
+import queue
+import time
 import os
 import bcrypt
-from dotenv import load_dotenv
+from env_cache import load_env
 
 # Load environment variables
-load_dotenv()
+load_env()
 
 DB_PATH = os.getenv("DATABASE_PATH", "prometheus.db")
 SESSION_EXPIRY_DAYS = int(os.getenv("SESSION_EXPIRY_DAYS", "30"))
+# bcrypt work factor; "auto" picks the highest cost hashing under ~250ms here
+BCRYPT_COST = os.getenv("BCRYPT_COST", "12")
+BCRYPT_MIN_COST, BCRYPT_MAX_COST = 4, 31  # Range bcrypt.gensalt accepts
 
 # Thread-local storage for database connections (connection pooling)
 _thread_local = threading.local()
 
+# Applied to every new connection: WAL lets readers run alongside the writer,
+# and NORMAL sync only fsyncs at checkpoints (safe in WAL mode)
+_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA busy_timeout=5000",
+)
+
+# Hot statements kept as module constants: sqlite3 caches compiled statements
+# per connection keyed by the exact SQL text, so these are parsed only once
+_CACHED_STATEMENTS = 256
+_SELECT_USER = 'SELECT id, username, email, password_hash FROM users WHERE username = ?'
+# Primary key probe on the WITHOUT ROWID sessions table
+_SESSION_EXISTS = 'SELECT 1 FROM sessions WHERE token = ?'
+_SELECT_SESSION_USER = '''
+    SELECT users.id, users.username, users.email, sessions.expires_at
+    FROM sessions
+    JOIN users ON sessions.user_id = users.id
+    WHERE sessions.token = ?
+'''
+_INSERT_CHAT = 'INSERT INTO chat_history (user_id, query, language, response) VALUES (?, ?, ?, ?)'
+_INSERT_SESSION = 'INSERT INTO sessions (user_id, token, expires_at) VALUES (?, ?, ?)'
+
+def _configure(conn: sqlite3.Connection):
+    """Apply connection-level performance settings"""
+    for pragma in _PRAGMAS:
+        conn.execute(pragma)
+
 @contextmanager
 def get_db_connection():
     """Context manager for database connections with connection pooling"""
     if not hasattr(_thread_local, 'conn') or _thread_local.conn is None:
-        _thread_local.conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+        _thread_local.conn = sqlite3.connect(
+            DB_PATH, check_same_thread=False, cached_statements=_CACHED_STATEMENTS
+        )
         _thread_local.conn.row_factory = sqlite3.Row
+        _configure(_thread_local.conn)
     try:
         yield _thread_local.conn
     except Exception as e:
         _thread_local.conn.rollback()
         raise
 
+# Chat inserts are queued and written in batches by a background thread:
+# one executemany + commit (one fsync) per batch instead of per chat
+_CHAT_BATCH_SIZE = 128
+_CHAT_FLUSH_INTERVAL = 0.2  # seconds
+_chat_queue: "queue.Queue" = queue.Queue()
+# Queue markers: _FLUSH ends the current batch early, None stops the writer
+_FLUSH = object()
+_chat_writer: Optional[threading.Thread] = None
+_chat_writer_lock = threading.Lock()
+# Queued or in-flight chats per user; flush_chats(user_id) waits on these only
+_pending_chats: Dict[int, int] = {}
+_pending_cond = threading.Condition()
+
+def _chats_written(rows: list):
+    with _pending_cond:
+        for row in rows:
+            left = _pending_chats.get(row[0], 0) - 1
+            if left > 0:
+                _pending_chats[row[0]] = left
+            else:
+                _pending_chats.pop(row[0], None)
+        _pending_cond.notify_all()
+
+def _chat_writer_loop():
+    running = True
+    while running:
+        batch = [_chat_queue.get()]
+        deadline = time.monotonic() + _CHAT_FLUSH_INTERVAL
+        while len(batch) < _CHAT_BATCH_SIZE and isinstance(batch[-1], tuple):
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(_chat_queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        
+        rows = [row for row in batch if isinstance(row, tuple)]
+        running = batch[-1] is not None
+        try:
+            if rows:
+                with get_db_connection() as conn:
+                    conn.executemany(_INSERT_CHAT, rows)
+                    conn.commit()
+        except Exception as e:
+            print(f"Error saving chat: {e}")
+        finally:
+            _chats_written(rows)
+            for _ in batch:
+                _chat_queue.task_done()
+    
+    if getattr(_thread_local, 'conn', None) is not None:
+        _thread_local.conn.close()
+        _thread_local.conn = None
+
+def start_chat_writer():
+    """Start the background chat writer (no-op if already running)"""
+    global _chat_writer
+    with _chat_writer_lock:
+        if _chat_writer is None or not _chat_writer.is_alive():
+            _chat_writer = threading.Thread(target=_chat_writer_loop, name="chat-writer", daemon=True)
+            _chat_writer.start()
+
+def _take_queued_chats(user_id: int) -> list:
+    # Pull the user's chats the writer has not picked up yet (Queue keeps its
+    # items in .queue, guarded by .mutex)
+    with _chat_queue.mutex:
+        rows = [row for row in _chat_queue.queue if isinstance(row, tuple) and row[0] == user_id]
+        if rows:
+            rest = [row for row in _chat_queue.queue if not (isinstance(row, tuple) and row[0] == user_id)]
+            _chat_queue.queue.clear()
+            _chat_queue.queue.extend(rest)
+    for _ in rows:
+        _chat_queue.task_done()
+    return rows
+
+def flush_chats(user_id: int):
+    """Block until the user's queued chats are written (other users' chats are not waited on)"""
+    flushing = False
+    while True:
+        rows = _take_queued_chats(user_id)
+        if rows:
+            try:
+                with get_db_connection() as conn:
+                    conn.executemany(_INSERT_CHAT, rows)
+                    conn.commit()
+            except Exception as e:
+                print(f"Error saving chat: {e}")
+            finally:
+                _chats_written(rows)
+        with _pending_cond:
+            if not _pending_chats.get(user_id):
+                return
+            # The rest are in the writer's current batch: end it early
+            if _chat_writer is None or not _chat_writer.is_alive():
+                return
+            if not flushing:
+                _chat_queue.put(_FLUSH)
+                flushing = True
+            _pending_cond.wait(_CHAT_FLUSH_INTERVAL)
+
+@atexit.register
+def stop_chat_writer():
+    """Write pending chats and stop the background writer"""
+    global _chat_writer
+    with _chat_writer_lock:
+        if _chat_writer is not None and _chat_writer.is_alive():
+            _chat_queue.put(None)
+            _chat_writer.join()
+        _chat_writer = None
+    # Chats queued while the writer was stopping
+    while True:
+        try:
+            row = _chat_queue.get_nowait()
+        except queue.Empty:
+            break
+        if isinstance(row, tuple):
+            save_chat_sync(*row)
+            _chats_written([row])
+        _chat_queue.task_done()
+
+# Connections inherited across fork, kept referenced so the child never closes them
+_forked_conns: List[sqlite3.Connection] = []
+
+def _reset_after_fork():
+    # Threads do not survive fork (gunicorn --preload); the child starts its
+    # own writer from init_database() in the app lifespan
+    global _chat_queue, _chat_writer, _chat_writer_lock, _pending_chats, _pending_cond
+    _chat_queue = queue.Queue()
+    _chat_writer = None
+    _chat_writer_lock = threading.Lock()
+    _pending_chats = {}
+    _pending_cond = threading.Condition()
+    # SQLite connections must not be used across fork: the child opens its own
+    conn = getattr(_thread_local, 'conn', None)
+    if conn is not None:
+        _forked_conns.append(conn)
+        _thread_local.conn = None
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+# Session tokens keyed directly by token: a lookup is one b-tree probe
+# instead of token index -> rowid -> row
+_CREATE_SESSIONS = '''
+    CREATE TABLE IF NOT EXISTS sessions (
+        token TEXT PRIMARY KEY,
+        user_id INTEGER NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        expires_at TIMESTAMP NOT NULL,
+        FOREIGN KEY (user_id) REFERENCES users(id)
+    ) WITHOUT ROWID
+'''
+
+def _upgrade_sessions_table(cursor: sqlite3.Cursor):
+    """Rebuild a sessions table from before WITHOUT ROWID, keeping its sessions"""
+    columns = [row[1] for row in cursor.execute('PRAGMA table_info(sessions)')]
+    if 'id' not in columns:
+        return
+    cursor.execute('ALTER TABLE sessions RENAME TO sessions_old')
+    cursor.execute(_CREATE_SESSIONS)
+    cursor.execute('''
+        INSERT INTO sessions (token, user_id, created_at, expires_at)
+        SELECT token, user_id, created_at, expires_at FROM sessions_old
+    ''')
+    cursor.execute('DROP TABLE sessions_old')
+
+# Full-text index over chat_history. The trigram tokenizer matches any
+# substring of 3+ characters, so search keeps LIKE '%x%' semantics without
+# scanning every row. Kept in sync by triggers on chat_history.
+_fts_enabled = False
+
+def _init_chat_search(cursor: sqlite3.Cursor) -> bool:
+    """Create the chat_history_fts index and triggers; False if FTS5 is unavailable"""
+    exists = cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'chat_history_fts'"
+    ).fetchone() is not None
+    try:
+        cursor.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS chat_history_fts USING fts5(
+                query, response, content='chat_history', content_rowid='id', tokenize='trigram'
+            )
+        ''')
+    except sqlite3.OperationalError as e:
+        print(f"Chat search index unavailable, using LIKE: {e}")
+        return False
+    
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS chat_history_fts_insert AFTER INSERT ON chat_history BEGIN
+            INSERT INTO chat_history_fts(rowid, query, response) VALUES (new.id, new.query, new.response);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS chat_history_fts_delete AFTER DELETE ON chat_history BEGIN
+            INSERT INTO chat_history_fts(chat_history_fts, rowid, query, response)
+            VALUES ('delete', old.id, old.query, old.response);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS chat_history_fts_update AFTER UPDATE ON chat_history BEGIN
+            INSERT INTO chat_history_fts(chat_history_fts, rowid, query, response)
+            VALUES ('delete', old.id, old.query, old.response);
+            INSERT INTO chat_history_fts(rowid, query, response) VALUES (new.id, new.query, new.response);
+        END
+    ''')
+    if not exists:
+        # Index chats saved before the search index existed
+        cursor.execute("INSERT INTO chat_history_fts(chat_history_fts) VALUES ('rebuild')")
+    return True
+
+def _fts_phrase(text: str) -> str:
+    """Quote text as a single FTS5 phrase so operators in it are matched literally"""
+    return '"' + text.replace('"', '""') + '"'
+
 def init_database():
     """Initialize SQLite database with users and chat_history tables"""
     with get_db_connection() as conn:
@@ -63,39 +319,78 @@ def init_database():
     ''')
     
     # Create indexes for better query performance
-    cursor.execute('''
-        CREATE INDEX IF NOT EXISTS idx_chat_history_user_id 
-        ON chat_history(user_id)
-    ''')
-    
     cursor.execute('''
         CREATE INDEX IF NOT EXISTS idx_chat_history_timestamp 
         ON chat_history(timestamp DESC)
     ''')
     
+    # Covers the per-user filters, count and ordering of get_chat_history
+    # (id is the rowid, which every index already carries)
     cursor.execute('''
-        CREATE INDEX IF NOT EXISTS idx_chat_history_user_timestamp 
-        ON chat_history(user_id, timestamp DESC)
+        CREATE INDEX IF NOT EXISTS idx_chat_history_covering 
+        ON chat_history(user_id, timestamp DESC, language)
     ''')
     
+    # Prefixes of idx_chat_history_covering, only slowing down inserts
+    cursor.execute('DROP INDEX IF EXISTS idx_chat_history_user_id')
+    cursor.execute('DROP INDEX IF EXISTS idx_chat_history_user_timestamp')
+    
     # Session tokens table
+    _upgrade_sessions_table(cursor)
+    cursor.execute(_CREATE_SESSIONS)
+    
+    # For purge_expired_sessions
     cursor.execute('''
-        CREATE TABLE IF NOT EXISTS sessions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            token TEXT UNIQUE NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            expires_at TIMESTAMP NOT NULL,
-            FOREIGN KEY (user_id) REFERENCES users(id)
-        )
+        CREATE INDEX IF NOT EXISTS idx_sessions_expires 
+        ON sessions(expires_at)
     ''')
     
+    global _fts_enabled
+    _fts_enabled = _init_chat_search(cursor)
+    
     conn.commit()
+    start_chat_writer()
+    # Settle the bcrypt cost at startup (before fork under gunicorn --preload),
+    # so a bad BCRYPT_COST fails here and every worker hashes at the same cost
+    get_bcrypt_rounds()
     print("Database initialized successfully")
 
+def calibrate_bcrypt(target_ms: float = 250, min_rounds: int = 10, max_rounds: int = 15) -> int:
+    """Return the highest bcrypt cost whose hash time stays under target_ms"""
+    chosen = min_rounds
+    for rounds in range(min_rounds, max_rounds + 1):
+        start = time.perf_counter()
+        bcrypt.hashpw(b"x" * 8, bcrypt.gensalt(rounds))
+        if (time.perf_counter() - start) * 1000 > target_ms:
+            break
+        chosen = rounds
+    return chosen
+
+_bcrypt_rounds: Optional[int] = None
+
+def get_bcrypt_rounds() -> int:
+    """bcrypt cost for new hashes (BCRYPT_COST, calibrated once when "auto")"""
+    global _bcrypt_rounds
+    if _bcrypt_rounds is None:
+        if BCRYPT_COST.strip().lower() == "auto":
+            _bcrypt_rounds = calibrate_bcrypt()
+            print(f"bcrypt cost calibrated to {_bcrypt_rounds}")
+        else:
+            try:
+                rounds = int(BCRYPT_COST)
+            except ValueError:
+                rounds = 0
+            if not BCRYPT_MIN_COST <= rounds <= BCRYPT_MAX_COST:
+                raise ValueError(
+                    f"BCRYPT_COST={BCRYPT_COST!r} must be 'auto' or an integer from "
+                    f"{BCRYPT_MIN_COST} to {BCRYPT_MAX_COST}"
+                )
+            _bcrypt_rounds = rounds
+    return _bcrypt_rounds
+
 def hash_password(password: str) -> str:
     """Hash password using bcrypt (secure password hashing)"""
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=get_bcrypt_rounds())
     return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
 
 def verify_password(password: str, hashed: str) -> bool:
@@ -105,6 +400,10 @@ def verify_password(password: str, hashed: str) -> bool:
     except Exception:
         return False
 
+# bcrypt releases the GIL, so a thread per core hashes in parallel; the pool
+# bounds concurrent logins and keeps them off the event loop and its threadpool
+_BCRYPT_POOL = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="bcrypt")
+
 def validate_password_strength(password: str) -> tuple[bool, str]:
     """Validate password meets security requirements"""
     if len(password) < 8:
@@ -167,10 +466,7 @@ def authenticate_user(username: str, password: str) -> Optional[Dict]:
             cursor = conn.cursor()
             
             # Fetch user by username
-            cursor.execute(
-                'SELECT id, username, email, password_hash FROM users WHERE username = ?',
-                (username.strip(),)
-            )
+            cursor.execute(_SELECT_USER, (username.strip(),))
             
             user = cursor.fetchone()
             if not user:
@@ -182,21 +478,14 @@ def authenticate_user(username: str, password: str) -> Optional[Dict]:
             if not verify_password(password, stored_hash):
                 return None
             
-            # Update last login
-            cursor.execute('UPDATE users SET last_login = ? WHERE id = ?', (datetime.now(), user_id))
-            
-            # Clean up expired sessions
-            cursor.execute('DELETE FROM sessions WHERE expires_at < ?', (datetime.now(),))
-            
-            # Create session token
+            # Update last login and create the session in one transaction
+            # (expired sessions are purged periodically, see purge_expired_sessions)
+            now = datetime.now()
             token = generate_token()
-            expires_at = datetime.now() + timedelta(days=SESSION_EXPIRY_DAYS)
-            cursor.execute(
-                'INSERT INTO sessions (user_id, token, expires_at) VALUES (?, ?, ?)',
-                (user_id, token, expires_at)
-            )
-            
-            conn.commit()
+            expires_at = now + timedelta(days=SESSION_EXPIRY_DAYS)
+            with conn:
+                cursor.execute('UPDATE users SET last_login = ? WHERE id = ?', (now, user_id))
+                cursor.execute(_INSERT_SESSION, (user_id, token, expires_at))
             
             return {
                 'user_id': user_id,
@@ -208,18 +497,60 @@ def authenticate_user(username: str, password: str) -> Optional[Dict]:
         print(f"Authentication error: {e}")
         return None
 
+async def create_user_async(username: str, email: str, password: str) -> Dict:
+    """create_user() on the bcrypt pool, for async request handlers"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_BCRYPT_POOL, create_user, username, email, password)
+
+async def authenticate_user_async(username: str, password: str) -> Optional[Dict]:
+    """authenticate_user() on the bcrypt pool, for async request handlers"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_BCRYPT_POOL, authenticate_user, username, password)
+
+# Recently verified tokens -> (checked_at, expires_at, user), so authenticated
+# requests skip the sessions/users join. The cache is per process (one per
+# gunicorn worker), so a hit still checks the session row exists: a logout
+# served by another worker takes effect immediately everywhere
+_TOKEN_CACHE_SIZE = 10_000
+_TOKEN_CACHE_TTL = 60  # seconds
+_token_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_token_cache_lock = threading.Lock()
+
+def _token_cache_get(token: str) -> Optional[Dict]:
+    with _token_cache_lock:
+        entry = _token_cache.get(token)
+        if entry is None:
+            return None
+        checked_at, expires_at, user = entry
+        if time.monotonic() - checked_at > _TOKEN_CACHE_TTL or expires_at < datetime.now():
+            del _token_cache[token]
+            return None
+        _token_cache.move_to_end(token)
+        return dict(user)
+
+def _token_cache_put(token: str, expires_at: datetime, user: Dict):
+    with _token_cache_lock:
+        _token_cache[token] = (time.monotonic(), expires_at, dict(user))
+        _token_cache.move_to_end(token)
+        while len(_token_cache) > _TOKEN_CACHE_SIZE:
+            _token_cache.popitem(last=False)
+
 def verify_token(token: str) -> Optional[Dict]:
     """Verify session token and return user info"""
+    cached = _token_cache_get(token)
     try:
         with get_db_connection() as conn:
             cursor = conn.cursor()
             
-            cursor.execute('''
-                SELECT users.id, users.username, users.email, sessions.expires_at
-                FROM sessions
-                JOIN users ON sessions.user_id = users.id
-                WHERE sessions.token = ?
-            ''', (token,))
+            if cached is not None:
+                if cursor.execute(_SESSION_EXISTS, (token,)).fetchone() is not None:
+                    return cached
+                # Logged out, possibly through another worker
+                with _token_cache_lock:
+                    _token_cache.pop(token, None)
+                return None
+            
+            cursor.execute(_SELECT_SESSION_USER, (token,))
             
             result = cursor.fetchone()
             
@@ -229,28 +560,37 @@ def verify_token(token: str) -> Optional[Dict]:
             user_id, username, email, expires_at = result
             
             # Check if token expired
-            if datetime.fromisoformat(expires_at) < datetime.now():
+            expires_at = datetime.fromisoformat(expires_at)
+            if expires_at < datetime.now():
                 return None
             
-            return {
+            user = {
                 'user_id': user_id,
                 'username': username,
                 'email': email
             }
+            _token_cache_put(token, expires_at, user)
+            return user
     except Exception as e:
         print(f"Token verification error: {e}")
         return None
 
 def save_chat(user_id: int, query: str, language: str, response: str):
-    """Save chat interaction to history"""
+    """Queue chat interaction for the background writer (written within ~200ms)"""
+    if _chat_writer is None or not _chat_writer.is_alive():
+        save_chat_sync(user_id, query, language, response)
+    else:
+        with _pending_cond:
+            _pending_chats[user_id] = _pending_chats.get(user_id, 0) + 1
+        _chat_queue.put((user_id, query, language, response))
+
+def save_chat_sync(user_id: int, query: str, language: str, response: str):
+    """Save chat interaction to history immediately"""
     try:
         with get_db_connection() as conn:
             cursor = conn.cursor()
             
-            cursor.execute(
-                'INSERT INTO chat_history (user_id, query, language, response) VALUES (?, ?, ?, ?)',
-                (user_id, query, language, response)
-            )
+            cursor.execute(_INSERT_CHAT, (user_id, query, language, response))
             
             conn.commit()
     except Exception as e:
@@ -276,6 +616,8 @@ def get_chat_history(
     Returns:
         Dict with 'chats', 'total', 'has_more' keys
     """
+    # Make the user's own recent chats visible
+    flush_chats(user_id)
     try:
         with get_db_connection() as conn:
             cursor = conn.cursor()
@@ -288,32 +630,44 @@ def get_chat_history(
                 where_clauses.append('language = ?')
                 params.append(language)
             
-            if search:
+            if search and _fts_enabled and len(search) >= 3:
+                where_clauses.append(
+                    'id IN (SELECT rowid FROM chat_history_fts WHERE chat_history_fts MATCH ?)'
+                )
+                params.append(_fts_phrase(search))
+            elif search:
+                # Trigrams cannot match 1-2 character searches
                 where_clauses.append('(query LIKE ? OR response LIKE ?)')
                 search_pattern = f'%{search}%'
                 params.extend([search_pattern, search_pattern])
             
             where_clause = ' AND '.join(where_clauses)
             
-            # Get total count
-            count_query = f'SELECT COUNT(*) FROM chat_history WHERE {where_clause}'
-            cursor.execute(count_query, params)
-            total = cursor.fetchone()[0]
-            
-            # Get paginated results
+            # Page and total count in one pass over the matching rows
             query = f'''
-                SELECT id, query, language, response, timestamp
+                SELECT id, query, language, response, timestamp, COUNT(*) OVER () AS total,
+                       substr(response, 1, 200) AS preview, length(response) > 200 AS truncated
                 FROM chat_history
                 WHERE {where_clause}
                 ORDER BY timestamp DESC
                 LIMIT ? OFFSET ?
             '''
             cursor.execute(query, params + [limit, offset])
+            rows = cursor.fetchall()
+            
+            if rows:
+                total = rows[0][5]
+            elif offset > 0:
+                # Past the last page: no row carries the count
+                cursor.execute(f'SELECT COUNT(*) FROM chat_history WHERE {where_clause}', params)
+                total = cursor.fetchone()[0]
+            else:
+                total = 0
             
             history = []
-            for row in cursor.fetchall():
-                # Truncate long responses for list view (optimize transfer size)
-                response_preview = row[3][:200] + '...' if len(row[3]) > 200 else row[3]
+            for row in rows:
+                # Preview is cut in SQL so long responses are not sliced in Python
+                response_preview = row[6] + '...' if row[7] else row[6]
                 
                 history.append({
                     'id': row[0],
@@ -341,8 +695,22 @@ def get_chat_history(
             'total_pages': 0
         }
 
+def purge_expired_sessions() -> int:
+    """Delete expired session tokens, returning how many were removed"""
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('DELETE FROM sessions WHERE expires_at < ?', (datetime.now(),))
+            conn.commit()
+            return cursor.rowcount
+    except Exception as e:
+        print(f"Error purging expired sessions: {e}")
+        return 0
+
 def logout_user(token: str):
     """Remove session token"""
+    with _token_cache_lock:
+        _token_cache.pop(token, None)
     try:
         with get_db_connection() as conn:
             cursor = conn.cursor()
@@ -381,6 +749,9 @@ def delete_chat(chat_id: int, user_id: int) -> bool:
         return False
 
 
+# Rows deleted per transaction, so the write lock is released between batches
+_CLEAR_BATCH_SIZE = 1000
+
 def clear_chat_history(user_id: int) -> int:
     """
     Clear all chat history for a user
@@ -391,21 +762,36 @@ def clear_chat_history(user_id: int) -> int:
     Returns:
         Number of chats deleted
     """
+    flush_chats(user_id)
     try:
         with get_db_connection() as conn:
             cursor = conn.cursor()
+            deleted_count = 0
             
-            cursor.execute('DELETE FROM chat_history WHERE user_id = ?', (user_id,))
-            deleted_count = cursor.rowcount
-            
-            conn.commit()
+            while True:
+                cursor.execute('''
+                    DELETE FROM chat_history WHERE id IN (
+                        SELECT id FROM chat_history WHERE user_id = ? LIMIT ?
+                    )
+                ''', (user_id, _CLEAR_BATCH_SIZE))
+                conn.commit()
+                if cursor.rowcount == 0:
+                    break
+                deleted_count += cursor.rowcount
             
             return deleted_count
     except Exception as e:
         print(f"Error clearing chat history: {e}")
         return 0
-    
-    return deleted_count
+
+
+async def get_chat_history_async(user_id: int, **kwargs) -> Dict:
+    """get_chat_history() in a worker thread, for async request handlers"""
+    return await asyncio.to_thread(get_chat_history, user_id, **kwargs)
+
+async def clear_chat_history_async(user_id: int) -> int:
+    """clear_chat_history() in a worker thread, for async request handlers"""
+    return await asyncio.to_thread(clear_chat_history, user_id)
 
 
 # Initialize database on module import
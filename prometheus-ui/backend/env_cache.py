@@ -0,0 +1,52 @@
+"""
+Cached .env loading
+config.py and database.py both load the .env file on import, and every
+worker/subprocess imports them again. The parsed values are memoized by
+(path, mtime, size), and a marker in os.environ lets child processes, which
+inherit the already-loaded variables, skip the parse entirely.
+"""
+import os
+from typing import Dict, Optional, Tuple
+
+from dotenv import dotenv_values, find_dotenv
+
+# Inherited by child processes; holds the key of the .env file already loaded
+_MARKER = "PROMETHEUS_DOTENV_LOADED"
+
+_cache: Dict[Tuple[str, int, int], Dict[str, Optional[str]]] = {}
+
+
+def load_env(path: Optional[str] = None) -> bool:
+    """
+    load_dotenv() replacement that only parses the file when it changed
+
+    Existing environment variables are never overridden, as with load_dotenv().
+    Returns True if a .env file was found.
+    """
+    path = path or find_dotenv()
+    if not path:
+        return False
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+
+    key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    marker = f"{key[0]}:{key[1]}:{key[2]}"
+    if os.environ.get(_MARKER) == marker:
+        return True
+
+    values = _cache.get(key)
+    if values is None:
+        values = _cache[key] = dotenv_values(path)
+    for name, value in values.items():
+        if value is not None and name not in os.environ:
+            os.environ[name] = value
+    os.environ[_MARKER] = marker
+    return True
+
+
+def clear_cache():
+    """Forget parsed files so the next load_env() re-reads them"""
+    _cache.clear()
+    os.environ.pop(_MARKER, None)
@@ -2,32 +2,52 @@
 User Feedback System for continuous improvement
 Collect thumbs up/down on responses to improve quality
 """
-import sqlite3
+import threading
+import time
 from datetime import datetime
 from typing import Optional
 
-DB_PATH = "prometheus.db"
+# Reuse the thread-local connections (and DATABASE_PATH) of the main database
+from database import get_db_connection
+
+_INSERT_FEEDBACK = 'INSERT INTO feedback (chat_id, user_id, rating, comment) VALUES (?, ?, ?, ?)'
+
+# Stats are read far more often than feedback is written
+_STATS_TTL = 30
+_stats_cache: Optional[tuple] = None  # (stored_at, stats)
+_stats_lock = threading.Lock()
+
+def _invalidate_stats():
+    global _stats_cache
+    with _stats_lock:
+        _stats_cache = None
 
 def init_feedback_table():
     """Add feedback table to database"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS feedback (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            chat_id INTEGER,
-            user_id INTEGER,
-            rating INTEGER CHECK(rating IN (1, -1)),  -- 1 = thumbs up, -1 = thumbs down
-            comment TEXT,
-            timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (chat_id) REFERENCES chat_history(id),
-            FOREIGN KEY (user_id) REFERENCES users(id)
-        )
-    ''')
-    
-    conn.commit()
-    conn.close()
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS feedback (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                chat_id INTEGER,
+                user_id INTEGER,
+                rating INTEGER CHECK(rating IN (1, -1)),  -- 1 = thumbs up, -1 = thumbs down
+                comment TEXT,
+                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (chat_id) REFERENCES chat_history(id),
+                FOREIGN KEY (user_id) REFERENCES users(id)
+            )
+        ''')
+        
+        # Lets the stats aggregate count ratings from the index alone
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_feedback_rating
+            ON feedback(rating)
+        ''')
+        
+        conn.commit()
+    _invalidate_stats()
     print("✅ Feedback table initialized")
 
 def save_feedback(
@@ -37,57 +57,60 @@ def save_feedback(
     comment: Optional[str] = None
 ):
     """Save user feedback on a response"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute(
-        'INSERT INTO feedback (chat_id, user_id, rating, comment) VALUES (?, ?, ?, ?)',
-        (chat_id, user_id, rating, comment)
-    )
-    
-    conn.commit()
-    conn.close()
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        
+        cursor.execute(_INSERT_FEEDBACK, (chat_id, user_id, rating, comment))
+        
+        conn.commit()
+    _invalidate_stats()
 
 def get_feedback_stats():
-    """Get overall feedback statistics"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        SELECT 
-            COUNT(*) as total,
-            SUM(CASE WHEN rating = 1 THEN 1 ELSE 0 END) as thumbs_up,
-            SUM(CASE WHEN rating = -1 THEN 1 ELSE 0 END) as thumbs_down,
-            AVG(CASE WHEN rating = 1 THEN 1.0 ELSE 0.0 END) as satisfaction_rate
-        FROM feedback
-    ''')
+    """Get overall feedback statistics (cached for _STATS_TTL seconds)"""
+    global _stats_cache
+    with _stats_lock:
+        cached = _stats_cache
+    if cached is not None and time.monotonic() - cached[0] < _STATS_TTL:
+        return dict(cached[1])
     
-    stats = cursor.fetchone()
-    conn.close()
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT 
+                COUNT(*) as total,
+                COUNT(*) FILTER (WHERE rating = 1) as thumbs_up,
+                COUNT(*) FILTER (WHERE rating = -1) as thumbs_down
+            FROM feedback
+        ''')
+        
+        total, thumbs_up, thumbs_down = cursor.fetchone()
     
-    return {
-        'total': stats[0],
-        'thumbs_up': stats[1],
-        'thumbs_down': stats[2],
-        'satisfaction_rate': stats[3]
+    stats = {
+        'total': total,
+        'thumbs_up': thumbs_up,
+        'thumbs_down': thumbs_down,
+        'satisfaction_rate': thumbs_up / total if total else None
     }
+    with _stats_lock:
+        _stats_cache = (time.monotonic(), stats)
+    return dict(stats)
 
 def get_low_rated_queries():
     """Get queries with thumbs down to improve"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        SELECT ch.query, ch.response, f.comment, f.timestamp
-        FROM feedback f
-        JOIN chat_history ch ON f.chat_id = ch.id
-        WHERE f.rating = -1
-        ORDER BY f.timestamp DESC
-        LIMIT 20
-    ''')
-    
-    results = cursor.fetchall()
-    conn.close()
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT ch.query, ch.response, f.comment, f.timestamp
+            FROM feedback f
+            JOIN chat_history ch ON f.chat_id = ch.id
+            WHERE f.rating = -1
+            ORDER BY f.timestamp DESC
+            LIMIT 20
+        ''')
+        
+        results = cursor.fetchall()
     
     return [
         {
@@ -0,0 +1,18 @@
+"""
+Gunicorn configuration for production
+Runs several UvicornWorker processes; with preload_app the dataset is loaded
+once in the master and shared with the forked workers copy-on-write. The
+embedding model, ChromaDB and Whisper are not fork-safe and load per worker.
+"""
+import multiprocessing
+import os
+
+bind = f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '8000')}"
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+preload_app = True
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "180"))  # LLM answers can take a while
+keepalive = 5
+
+# Tells main.py to call load_dataset_resources() at import time, i.e. before fork
+os.environ.setdefault("PRELOAD_RESOURCES", "true")
@@ -0,0 +1,202 @@
+"""
+Micro-batching for Ollama generations
+Prompts arriving within a short window are dispatched to Ollama together so
+the server's parallel slots are filled in one go instead of one at a time.
+Responses are cached by prompt hash so repeated prompts skip generation.
+"""
+import json
+import time
+import asyncio
+import hashlib
+import logging
+import threading
+import concurrent.futures
+from collections import OrderedDict
+from typing import Optional
+
+import ollama
+
+logger = logging.getLogger(__name__)
+
+
+class OllamaBatcher:
+    """
+    Collects generate() calls from worker threads into batches
+
+    The RAG pipeline runs in the threadpool, so callers block on a
+    concurrent future while the batching loop runs on the event loop.
+    Without a running loop (scripts, tests) calls go straight to Ollama.
+    """
+
+    def __init__(self, window: float = 0.02, max_batch: int = 8, keep_alive: str = "10m",
+                 cache_size: int = 1024, cache_ttl: float = 3600, timeout: Optional[float] = None):
+        self.window = window
+        self.max_batch = max_batch
+        self.keep_alive = keep_alive
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        # Longest a caller waits on a batched generation (None = no limit)
+        self.timeout = timeout
+        self._cache: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._client: Optional[ollama.AsyncClient] = None
+        # The loop only keeps weak references to tasks, so in-flight dispatches are held here
+        self._inflight: set = set()
+
+    async def start(self, timeout: Optional[float] = None):
+        """Start the batching loop on the running event loop (call from lifespan)"""
+        if timeout is not None:
+            self.timeout = timeout
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.max_batch)
+        self._client = ollama.AsyncClient()
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Ollama batcher started (window={self.window * 1000:.0f}ms, max_batch={self.max_batch})")
+
+    async def stop(self):
+        """Stop the batching loop, failing queued and in-flight calls; later calls go direct"""
+        task, self._task = self._task, None
+        self._loop = None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+        inflight = list(self._inflight)
+        for dispatch in inflight:
+            dispatch.cancel()
+        await asyncio.gather(*inflight, return_exceptions=True)
+
+        if self._queue is not None:
+            while not self._queue.empty():
+                _, future = self._queue.get_nowait()
+                self._settle(future, error=RuntimeError("Ollama batcher stopped"))
+
+    def generate(self, **kwargs):
+        """Blocking ollama.generate() replacement - must not be called from the event loop thread"""
+        key = self._cache_key(kwargs)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+
+        kwargs.setdefault("keep_alive", self.keep_alive)
+        if self._loop is None or not self._loop.is_running():
+            response = ollama.generate(**kwargs)
+        else:
+            future = concurrent.futures.Future()
+            self._loop.call_soon_threadsafe(self._enqueue, kwargs, future)
+            try:
+                response = future.result(timeout=self.timeout)
+            except concurrent.futures.TimeoutError:
+                # Let the batching loop skip or discard the generation
+                future.cancel()
+                raise
+
+        self._cache_put(key, response)
+        return response
+
+    @staticmethod
+    def _cache_key(kwargs: dict) -> bytes:
+        # Model and options change the output, so they are part of the key
+        payload = json.dumps(
+            {"model": kwargs.get("model"), "prompt": kwargs.get("prompt"), "options": kwargs.get("options")},
+            sort_keys=True, ensure_ascii=False, default=str
+        )
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).digest()
+
+    def _cache_get(self, key: bytes):
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            stored_at, response = entry
+            if time.monotonic() - stored_at > self.cache_ttl:
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return response
+
+    def _cache_put(self, key: bytes, response):
+        with self._cache_lock:
+            self._cache[key] = (time.monotonic(), response)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def clear_cache(self) -> int:
+        """Drop cached responses, returning how many were removed"""
+        with self._cache_lock:
+            cleared = len(self._cache)
+            self._cache.clear()
+        return cleared
+
+    def _enqueue(self, kwargs: dict, future: concurrent.futures.Future):
+        # Runs on the loop; a call scheduled just before stop() must not be queued
+        if self._task is None:
+            self._settle(future, error=RuntimeError("Ollama batcher stopped"))
+        else:
+            self._queue.put_nowait((kwargs, future))
+
+    @staticmethod
+    def _settle(future: concurrent.futures.Future, result=None, error: Optional[BaseException] = None):
+        # The caller may have cancelled the future after timing out
+        try:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+        except concurrent.futures.InvalidStateError:
+            pass
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        batch = []
+        try:
+            while True:
+                batch = [await self._queue.get()]
+                deadline = loop.time() + self.window
+                while len(batch) < self.max_batch:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+
+                if len(batch) > 1:
+                    logger.info(f"Dispatching {len(batch)} batched Ollama generations")
+                while batch:
+                    kwargs, future = batch[0]
+                    if not future.cancelled():
+                        await self._slots.acquire()
+                        dispatch = asyncio.create_task(self._dispatch(kwargs, future))
+                        self._inflight.add(dispatch)
+                        dispatch.add_done_callback(self._inflight.discard)
+                    batch.pop(0)
+        finally:
+            # Cancelled by stop() with part of a batch still undispatched
+            for _, future in batch:
+                self._settle(future, error=RuntimeError("Ollama batcher stopped"))
+
+    async def _dispatch(self, kwargs: dict, future: concurrent.futures.Future):
+        try:
+            self._settle(future, await self._client.generate(**kwargs))
+        except asyncio.CancelledError:
+            self._settle(future, error=RuntimeError("Ollama batcher stopped"))
+            raise
+        except Exception as e:
+            self._settle(future, error=e)
+        finally:
+            self._slots.release()
+
+
+# Global batcher instance
+llm_batcher = OllamaBatcher()
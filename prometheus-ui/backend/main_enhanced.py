@@ -4,14 +4,17 @@ Multilingual Startup Funding Query System
 With Advanced Features: Caching, Analytics, Webhooks, A/B Testing, etc.
 """
 
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 
 from config import Config
+from security import LiteCORS
 from services import (
     rag_service, whisper_service, cache_service,
     analytics_service, email_service, translation_service
@@ -28,33 +31,10 @@ logger = logging.getLogger(__name__)
 # Initialize rate limiter
 limiter = Limiter(key_func=get_remote_address) if Config.RATE_LIMIT_ENABLED else None
 
-# Create FastAPI app
-app = FastAPI(
-    title="Prometheus RAG API - Enhanced",
-    version="3.0.0",
-    description="Multilingual Startup Funding Query System with Advanced Features",
-    docs_url="/docs",  # Swagger UI
-    redoc_url="/redoc"  # ReDoc
-)
-
-# Add rate limiter to app state
-if limiter:
-    app.state.limiter = limiter
-    app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-
-# CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=Config.ALLOWED_ORIGINS,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
 
-@app.on_event("startup")
-async def startup_event():
-    """Initialize services on startup"""
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize services before serving, clean up on shutdown"""
     logger.info("=" * 60)
     logger.info("Starting Prometheus RAG API v3.0 (Enhanced)")
     logger.info("=" * 60)
@@ -62,12 +42,13 @@ async def startup_event():
     # Initialize RAG service
     logger.info("📊 Initializing RAG service...")
     dataset_path = Config.DATASET_PATH
-    rag_service.initialize(dataset_path)
+    await asyncio.to_thread(rag_service.initialize, dataset_path)
     logger.info("✅ RAG service ready")
     
     # Initialize Whisper service
     logger.info("🎤 Initializing Whisper STT model...")
-    whisper_service.initialize(
+    await asyncio.to_thread(
+        whisper_service.initialize,
         model_size=Config.WHISPER_MODEL_SIZE,
         device=Config.WHISPER_DEVICE,
         compute_type=Config.WHISPER_COMPUTE_TYPE
@@ -90,11 +71,12 @@ async def startup_event():
     logger.info("📚 API Documentation: http://localhost:8000/docs")
     logger.info("🔗 ReDoc: http://localhost:8000/redoc")
     logger.info("=" * 60)
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Cleanup on shutdown"""
+    
+    ticker = asyncio.create_task(health.timestamp_ticker())
+    
+    yield
+    
+    ticker.cancel()
     logger.info("Shutting down Prometheus RAG API...")
     
     # Invalidate cache
@@ -104,6 +86,28 @@ async def shutdown_event():
     logger.info("Shutdown complete")
 
 
+# Create FastAPI app
+app = FastAPI(
+    lifespan=lifespan,
+    title="Prometheus RAG API - Enhanced",
+    version="3.0.0",
+    description="Multilingual Startup Funding Query System with Advanced Features",
+    docs_url="/docs",  # Swagger UI
+    redoc_url="/redoc"  # ReDoc
+)
+
+# Add rate limiter to app state
+if limiter:
+    app.state.limiter = limiter
+    app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+
+# CORS middleware
+app.add_middleware(LiteCORS, origins=Config.ALLOWED_ORIGINS)
+
+# Compress larger JSON responses (RAG answers with source lists)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+
 # Register routers
 app.include_router(auth.router)
 app.include_router(rag.router)
@@ -153,10 +157,13 @@ async def clear_cache():
 
 
 if __name__ == "__main__":
+    import sys
     import uvicorn
     uvicorn.run(
         "main_enhanced:app",
         host=Config.HOST,
         port=Config.PORT,
-        reload=Config.DEBUG
+        reload=Config.DEBUG,
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools"
     )
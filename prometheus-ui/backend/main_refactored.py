@@ -4,14 +4,17 @@ Multilingual Startup Funding Query System
 Enhanced with ChromaDB + Ollama Llama 3.1 8B + RAGAS Evaluation
 """
 
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 
 from config import Config
+from security import LiteCORS
 from services import rag_service, whisper_service
 from routes import auth, rag, chat, health
 
@@ -25,53 +28,54 @@ logger = logging.getLogger(__name__)
 # Initialize rate limiter
 limiter = Limiter(key_func=get_remote_address) if Config.RATE_LIMIT_ENABLED else None
 
-# Create FastAPI app
-app = FastAPI(
-    title="Prometheus RAG API",
-    version="2.0.0",
-    description="Multilingual Startup Funding Query System with RAG"
-)
 
-# Add rate limiter to app state
-if limiter:
-    app.state.limiter = limiter
-    app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-
-# CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=Config.ALLOWED_ORIGINS,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-
-@app.on_event("startup")
-async def startup_event():
-    """Initialize services on startup"""
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize services before serving, clean up on shutdown"""
     logger.info("Starting Prometheus RAG API...")
     
     # Initialize RAG service
     dataset_path = Config.DATASET_PATH
     logger.info(f"Loading dataset from: {dataset_path}")
-    rag_service.initialize(dataset_path)
+    await asyncio.to_thread(rag_service.initialize, dataset_path)
     
     # Initialize Whisper service
     logger.info("Initializing Whisper STT model...")
-    whisper_service.initialize(
+    await asyncio.to_thread(
+        whisper_service.initialize,
         model_size=Config.WHISPER_MODEL_SIZE,
         device=Config.WHISPER_DEVICE,
         compute_type=Config.WHISPER_COMPUTE_TYPE
     )
     
     logger.info("All services initialized successfully!")
+    
+    ticker = asyncio.create_task(health.timestamp_ticker())
+    
+    yield
+    
+    ticker.cancel()
+    logger.info("Shutting down Prometheus RAG API...")
 
 
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Cleanup on shutdown"""
-    logger.info("Shutting down Prometheus RAG API...")
+# Create FastAPI app
+app = FastAPI(
+    lifespan=lifespan,
+    title="Prometheus RAG API",
+    version="2.0.0",
+    description="Multilingual Startup Funding Query System with RAG"
+)
+
+# Add rate limiter to app state
+if limiter:
+    app.state.limiter = limiter
+    app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+
+# CORS middleware
+app.add_middleware(LiteCORS, origins=Config.ALLOWED_ORIGINS)
+
+# Compress larger JSON responses (RAG answers with source lists)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
 
 
 # Register routers
@@ -92,10 +96,13 @@ async def root():
 
 
 if __name__ == "__main__":
+    import sys
     import uvicorn
     uvicorn.run(
         "main:app",
         host=Config.HOST,
         port=Config.PORT,
-        reload=Config.DEBUG
+        reload=Config.DEBUG,
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools"
     )
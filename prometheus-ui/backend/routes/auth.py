@@ -7,7 +7,7 @@ from slowapi import Limiter
 from slowapi.util import get_remote_address
 
 from models.schemas import SignupRequest, LoginRequest, AuthResponse
-from database import create_user, authenticate_user
+from database import create_user_async, authenticate_user_async
 from middleware import create_jwt_token
 from services import email_service
 
@@ -27,7 +27,7 @@ async def signup(request: Request, signup_data: SignupRequest):
     logger.info(f"Signup attempt: {signup_data.username}")
     
     try:
-        result = create_user(signup_data.username, signup_data.email, signup_data.password)
+        result = await create_user_async(signup_data.username, signup_data.email, signup_data.password)
         
         if not result['success']:
             logger.warning(f"Signup failed: {result.get('error')}")
@@ -66,7 +66,7 @@ async def login(request: Request, login_data: LoginRequest):
     """Authenticate user"""
     logger.info(f"Login attempt: {login_data.username}")
     
-    result = authenticate_user(login_data.username, login_data.password)
+    result = await authenticate_user_async(login_data.username, login_data.password)
     
     if result:
         logger.info(f"Login successful: {login_data.username} (ID: {result['user_id']})")
@@ -6,7 +6,7 @@ from fastapi import APIRouter, HTTPException
 from typing import List
 
 from models.schemas import ChatMessage, SaveChatRequest
-from database import get_chat_history, save_chat, clear_chat_history
+from database import get_chat_history_async, save_chat, clear_chat_history_async
 
 logger = logging.getLogger(__name__)
 
@@ -20,7 +20,7 @@ async def get_chat(user_id: int, limit: int = 50, offset: int = 0):
     logger.info(f"Fetching chat history for user {user_id}")
     
     try:
-        history = get_chat_history(user_id, limit=limit, offset=offset)
+        history = await get_chat_history_async(user_id, limit=limit, offset=offset)
         return history
     
     except Exception as e:
@@ -48,7 +48,7 @@ async def clear_chat(user_id: int):
     logger.info(f"Clearing chat history for user {user_id}")
     
     try:
-        deleted_count = clear_chat_history(user_id)
+        deleted_count = await clear_chat_history_async(user_id)
         return {"success": True, "message": f"Deleted {deleted_count} messages"}
     
     except Exception as e:
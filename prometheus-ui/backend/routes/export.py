@@ -1,12 +1,14 @@
 """
 Export routes - Export query results to various formats
 """
+import csv
 import logging
 from fastapi import APIRouter
 from fastapi.responses import StreamingResponse, Response
 from typing import List
 import pandas as pd
 import io
+import orjson
 
 from models.schemas import ExportRequest
 
@@ -21,13 +23,15 @@ async def export_csv(export_data: ExportRequest):
     logger.info(f"Exporting {len(export_data.sources)} results to CSV")
     
     try:
-        # Convert to DataFrame
-        df = pd.DataFrame(export_data.sources)
+        # Sources are already flat dicts - write them directly, no DataFrame needed.
+        # Columns are the union of keys in first-seen order, like pd.DataFrame(sources)
+        fieldnames = list(dict.fromkeys(key for source in export_data.sources for key in source))
         
         # Create CSV in memory
         stream = io.StringIO()
-        df.to_csv(stream, index=False)
-        stream.seek(0)
+        writer = csv.DictWriter(stream, fieldnames=fieldnames, restval='', lineterminator='\n')
+        writer.writeheader()
+        writer.writerows(export_data.sources)
         
         return StreamingResponse(
             iter([stream.getvalue()]),
@@ -91,14 +95,12 @@ async def export_json(export_data: ExportRequest):
     logger.info(f"Exporting {len(export_data.sources)} results to JSON")
     
     try:
-        import json
-        
-        # Create JSON
-        json_data = json.dumps({
+        # Create JSON (orjson serializes straight to bytes, much faster than json with indent)
+        json_data = orjson.dumps({
             "exported_at": pd.Timestamp.now().isoformat(),
             "total_results": len(export_data.sources),
             "results": export_data.sources
-        }, indent=2)
+        }, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
         
         return Response(
             content=json_data,
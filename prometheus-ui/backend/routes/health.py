@@ -1,6 +1,7 @@
 """
 Health check and metrics routes
 """
+import asyncio
 import logging
 import time
 from fastapi import APIRouter
@@ -16,13 +17,24 @@ router = APIRouter(tags=["Health"])
 # Track startup time
 _startup_time = time.time()
 
+# Second-resolution timestamp shared by all responses, refreshed by timestamp_ticker
+_now_iso = datetime.now().isoformat()
+
+
+async def timestamp_ticker():
+    """Refresh the cached response timestamp once per second (run as a lifespan task)"""
+    global _now_iso
+    while True:
+        _now_iso = datetime.now().isoformat()
+        await asyncio.sleep(1)
+
 
 @router.get("/health", response_model=HealthCheckResponse)
 async def health_check():
     """Health check endpoint"""
     return {
         "status": "healthy",
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": _now_iso,
         "version": "2.0.0"
     }
 
@@ -35,5 +47,5 @@ async def get_metrics():
     return {
         "uptime_seconds": uptime_seconds,
         "status": "operational",
-        "timestamp": datetime.now().isoformat()
+        "timestamp": _now_iso
     }
@@ -4,6 +4,7 @@ RAG query routes
 import logging
 import time
 from fastapi import APIRouter, HTTPException, Request, UploadFile, File
+from fastapi.concurrency import run_in_threadpool
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
@@ -38,7 +39,7 @@ async def query_rag(request: Request, rag_data: RagRequest):
             cached = True
         else:
             # Query RAG service
-            result = rag_service.query(rag_data.query, rag_data.lang, filters)
+            result = await run_in_threadpool(rag_service.query, rag_data.query, rag_data.lang, filters)
             
             # Cache the result
             cache_service.cache_response(rag_data.query, result, rag_data.lang, filters)
@@ -106,7 +107,7 @@ async def get_company_info(request: Request, company_name: str, lang: str = "en"
     """Get detailed company information"""
     logger.info(f"Company info request: {company_name}")
     
-    company_info = rag_service.get_company_info(company_name, lang)
+    company_info = await run_in_threadpool(rag_service.get_company_info, company_name, lang)
     
     if company_info is None:
         raise HTTPException(status_code=404, detail="Company not found")
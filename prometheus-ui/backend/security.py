@@ -125,6 +125,72 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
         return response
 
 
+class LiteCORS:
+    """
+    Pure ASGI CORS middleware
+
+    Answers preflight requests inline and appends the CORS headers to the
+    `http.response.start` message, without the Request/Response wrapping
+    done by BaseHTTPMiddleware-style middleware.
+    """
+
+    def __init__(self, app, origins: list, allow_credentials: bool = True, max_age: int = 600):
+        self.app = app
+        self.allow_all = "*" in origins
+        self.origins = frozenset(o.encode("latin-1") for o in origins)
+        self.allow_credentials = allow_credentials
+        self.max_age = str(max_age).encode("latin-1")
+
+    def _origin_headers(self, origin: bytes) -> list:
+        headers = [(b"access-control-allow-origin", origin), (b"vary", b"Origin")]
+        if self.allow_credentials:
+            headers.append((b"access-control-allow-credentials", b"true"))
+        return headers
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = None
+        request_method = None
+        request_headers = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                request_method = value
+            elif name == b"access-control-request-headers":
+                request_headers = value
+
+        if origin is None or not (self.allow_all or origin in self.origins):
+            await self.app(scope, receive, send)
+            return
+
+        cors_headers = self._origin_headers(origin)
+
+        # Preflight: answer directly, never reaches the app
+        if scope["method"] == "OPTIONS" and request_method is not None:
+            headers = cors_headers + [
+                (b"access-control-allow-methods", b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"),
+                (b"access-control-max-age", self.max_age),
+                (b"content-length", b"0"),
+            ]
+            if request_headers is not None:
+                headers.append((b"access-control-allow-headers", request_headers))
+            await send({"type": "http.response.start", "status": 200, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + cors_headers
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
 class RateLimitExceededError(HTTPException):
     """Custom exception for rate limit exceeded"""
     
@@ -0,0 +1,103 @@
+"""
+Semantic cache for RAG answers
+Skips ChromaDB retrieval + Ollama generation when a near-identical query
+(by embedding cosine similarity) was already answered
+"""
+import re
+import logging
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_NUMBERS = re.compile(r'\d+')
+
+
+class SemanticCache:
+    """In-process FIFO cache of (query embedding, response) pairs"""
+
+    def __init__(self, threshold: float = 0.95, max_entries: int = 1024):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # One bucket per (language, numbers in query, scope) so "top 5" never
+        # answers "top 10", "2019" never answers "2020", and queries about
+        # different sectors/cities/companies never answer each other
+        self._embeddings: Dict[Tuple, np.ndarray] = {}
+        self._responses: Dict[Tuple, List[dict]] = {}
+        # Bucket of every entry in insertion order; a bucket's own entries are
+        # also in insertion order, so the left end names the oldest entry
+        self._order: deque = deque()
+        self._size = 0
+
+    @staticmethod
+    def _bucket(query: str, lang: str, scope: Tuple) -> Tuple:
+        return (lang, tuple(_NUMBERS.findall(query)), scope)
+
+    @staticmethod
+    def _normalize(embedding) -> np.ndarray:
+        vec = np.asarray(embedding, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm > 0 else vec
+
+    def get(self, query: str, lang: str, embedding, scope: Tuple = ()) -> Optional[dict]:
+        """
+        Return cached response if a similar query was answered
+
+        scope holds the entities extracted from the query (sectors, city,
+        companies); only queries with the same scope can match.
+        """
+        bucket = self._bucket(query, lang, scope)
+        with self._lock:
+            matrix = self._embeddings.get(bucket)
+            if matrix is None:
+                return None
+            sims = matrix @ self._normalize(embedding)
+            best = int(np.argmax(sims))
+            if sims[best] < self.threshold:
+                return None
+            logger.info(f"Semantic cache HIT ({sims[best]:.3f}): {query[:50]}...")
+            return self._responses[bucket][best]
+
+    def put(self, query: str, lang: str, embedding, response: dict, scope: Tuple = ()):
+        """Store response for query embedding, evicting the oldest entry when full"""
+        bucket = self._bucket(query, lang, scope)
+        vec = self._normalize(embedding)[None, :]
+        with self._lock:
+            if self._size >= self.max_entries:
+                self._evict_oldest()
+            if bucket in self._embeddings:
+                self._embeddings[bucket] = np.vstack([self._embeddings[bucket], vec])
+                self._responses[bucket].append(response)
+            else:
+                self._embeddings[bucket] = vec
+                self._responses[bucket] = [response]
+            self._order.append(bucket)
+            self._size += 1
+
+    def _evict_oldest(self):
+        bucket = self._order.popleft()
+        self._embeddings[bucket] = self._embeddings[bucket][1:]
+        self._responses[bucket].pop(0)
+        if not self._responses[bucket]:
+            del self._embeddings[bucket]
+            del self._responses[bucket]
+        self._size -= 1
+
+    def clear(self):
+        """Drop all cached entries"""
+        with self._lock:
+            self._embeddings.clear()
+            self._responses.clear()
+            self._order.clear()
+            self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+
+# Global semantic cache instance
+semantic_cache = SemanticCache()
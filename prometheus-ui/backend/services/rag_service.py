@@ -1,8 +1,13 @@
 """
 RAG Service - Handles all RAG pipeline operations
 """
+import os
 import logging
 from typing import Dict, List, Optional
+
+# Tokenizer worker threads contend with the request threadpool; must be set before tokenizers load
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+
 import pandas as pd
 import chromadb
 from sentence_transformers import SentenceTransformer
@@ -14,6 +19,8 @@ from config import Config
 
 logger = logging.getLogger(__name__)
 
+EMBEDDING_MODEL_NAME = 'sentence-transformers/paraphrase-multilingual-mpnet-base-v2'
+
 class RAGService:
     """Service for RAG operations"""
     
@@ -28,9 +35,13 @@ class RAGService:
         """Initialize RAG components"""
         logger.info("Initializing RAG service...")
         
-        # Load embedding model
-        self.model = SentenceTransformer('sentence-transformers/paraphrase-multilingual-mpnet-base-v2')
-        logger.info("Embedding model loaded")
+        # Load embedding model once - re-initialization (e.g. the daily refresh) reuses it
+        if self.model is None:
+            self.model = SentenceTransformer(EMBEDDING_MODEL_NAME)
+            self.model.eval()
+            logger.info("Embedding model loaded")
+        else:
+            logger.info("Reusing loaded embedding model")
         
         # Load dataset
         self.df = pd.read_csv(dataset_path)
@@ -55,41 +66,47 @@ class RAGService:
             metadata={"hnsw:space": "cosine"}
         )
         
-        # Create embeddings
-        company_texts = self.df.apply(
-            lambda row: f"{row['Startup Name']} received {row['Amount_Cleaned']} funding in {row['Sector_Standardized']} sector on {row['Date_Parsed']} ({row['Year']}), {row['City']}, {row['State_Standardized']}",
-            axis=1
-        ).tolist()
-        
-        logger.info(f"Creating embeddings for {len(company_texts)} companies...")
-        embeddings = self.model.encode(company_texts, show_progress_bar=True)
-        
-        # Add to ChromaDB with clean data
-        clean_metadatas, clean_embeddings, clean_documents, clean_ids = [], [], [], []
-        
-        for i, (idx, row) in enumerate(self.df.iterrows()):
-            if (pd.isna(row['Startup Name']) or str(row['Startup Name']).strip().lower() == 'unknown' or
-                pd.isna(row['Sector_Standardized']) or str(row['Sector_Standardized']).strip().lower() == 'unknown'):
+        # Pull each column out once as a plain array and build texts + metadata in a single pass
+        df = self.df
+        names, amounts, sectors, dates, years, cities, states = (
+            df[col].astype(str).values for col in
+            ('Startup Name', 'Amount_Cleaned', 'Sector_Standardized', 'Date_Parsed', 'Year', 'City', 'State_Standardized')
+        )
+        investors_col = df["Investors' Name"].astype(str).values if "Investors' Name" in df.columns else [''] * len(df)
+        
+        clean_metadatas, clean_documents = [], []
+        for row_id, name, amount, sector, date, year, city, state, investors in zip(
+            df.index, names, amounts, sectors, dates, years, cities, states, investors_col
+        ):
+            company, sector_name = name.strip(), sector.strip()
+            if company.lower() in ('unknown', 'nan') or sector_name.lower() in ('unknown', 'nan'):
                 continue
             
             metadata = {
-                "company": str(row['Startup Name']).strip(),
-                "amount": str(row['Amount_Cleaned']) if pd.notna(row['Amount_Cleaned']) else '0',
-                "sector": str(row['Sector_Standardized']).strip(),
-                "row_id": idx
+                "company": company,
+                "amount": amount if amount != 'nan' else '0',
+                "sector": sector_name,
+                "row_id": row_id
             }
             
             # Add optional fields
-            for field, col in [("city", "City"), ("state", "State_Standardized"), 
-                              ("investors", "Investors' Name"), ("date", "Date_Parsed"), ("year", "Year")]:
-                value = str(row[col]).strip() if pd.notna(row.get(col)) else ''
-                if value and value.lower() not in ['unknown', 'nan', '', 'undisclosed']:
+            for field, value in [("city", city), ("state", state), ("investors", investors),
+                                 ("date", date), ("year", year)]:
+                value = value.strip()
+                if value and value.lower() not in ['unknown', 'nan', '<na>', '', 'undisclosed']:
                     metadata[field] = value if field != "year" else str(int(float(value)))
             
             clean_metadatas.append(metadata)
-            clean_embeddings.append(embeddings[i].tolist())
-            clean_documents.append(company_texts[i])
-            clean_ids.append(f"doc_{len(clean_ids)}")
+            clean_documents.append(
+                f"{name} received {amount} funding in {sector} sector on {date} ({year}), {city}, {state}"
+            )
+        
+        clean_ids = [f"doc_{i}" for i in range(len(clean_documents))]
+        
+        logger.info(f"Creating embeddings for {len(clean_documents)} companies...")
+        clean_embeddings = self.model.encode(
+            clean_documents, normalize_embeddings=True, show_progress_bar=True
+        ).tolist()
         
         self.collection.add(
             embeddings=clean_embeddings,
@@ -118,7 +135,12 @@ class RAGService:
         logger.info(f"RAG query: '{query[:50]}...' in {lang} with filters: {filters}")
         
         # Encode query
-        query_embedding = self.model.encode([query])[0]
+        query_embedding = self.model.encode(
+            query,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False
+        )
         
         # Build ChromaDB where clause from filters
         where_clause = None
@@ -144,16 +166,16 @@ class RAGService:
         results = self.collection.query(
             query_embeddings=[query_embedding.tolist()],
             n_results=100,
-            where=where_clause
+            where=where_clause,
+            include=["metadatas", "distances"]  # documents/embeddings are never read
         )
         
         # Parse and filter results
         SIMILARITY_THRESHOLD = 0.25
         retrieved_docs = []
         
-        for i in range(len(results['ids'][0])):
-            metadata = results['metadatas'][0][i]
-            similarity_score = float(1 - results['distances'][0][i])
+        for metadata, distance in zip(results['metadatas'][0], results['distances'][0]):
+            similarity_score = float(1 - distance)
             
             if similarity_score > SIMILARITY_THRESHOLD:
                 amount_numeric = parse_amount_to_numeric(metadata['amount'])
@@ -32,7 +32,7 @@ async def stream_response(answer: str):
 @app.post("/api/rag-stream")
 async def rag_stream(request: RagRequest):
     # Get answer from pipeline
-    result = prometheus_pipeline(request.query, request.lang)
+    result = await prometheus_pipeline_async(request.query, request.lang)
     
     # Stream the response
     return StreamingResponse(
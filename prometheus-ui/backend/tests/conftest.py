@@ -7,6 +7,10 @@ import tempfile
 import shutil
 from pathlib import Path
 
+# database.py creates its file on import, which happens while test modules are
+# collected - before the test_db fixture runs. Keep it out of the source tree.
+os.environ.setdefault("DATABASE_PATH", os.path.join(tempfile.mkdtemp(), "prometheus.db"))
+
 
 @pytest.fixture(scope="session")
 def test_db():
@@ -59,13 +63,30 @@ def reset_database(test_db):
     import database as db
     
     # Reinitialize database
-    db.init_db()
+    db.init_database()
     
     yield
     
     # Could add cleanup here if needed
 
 
+@pytest.fixture
+def fresh_db(tmp_path, monkeypatch):
+    """Point database.py at an empty per-test SQLite file"""
+    import database as db
+    
+    db.stop_chat_writer()
+    monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "prometheus.db"))
+    db._thread_local.conn = None
+    db.init_database()
+    
+    yield db
+    
+    db.stop_chat_writer()
+    db._thread_local.conn.close()
+    db._thread_local.conn = None
+
+
 @pytest.fixture
 def sample_query():
     """Sample RAG query for testing"""
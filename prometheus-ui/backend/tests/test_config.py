@@ -0,0 +1,54 @@
+"""
+Tests for lazily resolved configuration
+"""
+import pytest
+
+
+@pytest.fixture
+def unresolved_config(monkeypatch):
+    """Config with resolved attributes dropped, restored after the test"""
+    # Importing config exits when the production SECRET_KEY check fails
+    monkeypatch.setenv("SECRET_KEY", "x" * 40)
+    from config import Config
+    from config_validator import ConfigValidator
+
+    ConfigValidator.clear_cache()
+
+    cached = {name: value for name, value in vars(Config).items() if name.isupper()}
+    for name in cached:
+        delattr(Config, name)
+    yield Config
+
+    for name in [name for name in vars(Config) if name.isupper()]:
+        delattr(Config, name)
+    for name, value in cached.items():
+        setattr(Config, name, value)
+
+
+def test_bad_cast_names_the_field(unresolved_config, monkeypatch):
+    monkeypatch.setenv("PORT", "abc")
+    with pytest.raises(ValueError, match=r"PORT='abc' is not a valid int"):
+        unresolved_config.PORT
+
+
+def test_validate_fails_on_bad_cast(unresolved_config, monkeypatch, caplog):
+    monkeypatch.setenv("PORT", "abc")
+    monkeypatch.setenv("SESSION_EXPIRY_DAYS", "thirty")
+    with pytest.raises(ValueError):
+        unresolved_config.validate()
+    assert "PORT='abc' is not a valid int" in caplog.text
+    assert "SESSION_EXPIRY_DAYS='thirty' is not a valid int" in caplog.text
+
+
+
+def test_validate_passes_clean_config(unresolved_config):
+    assert unresolved_config.validate()
+
+
+def test_validate_runs_config_validator_checks(unresolved_config, monkeypatch, caplog):
+    monkeypatch.setenv("PORT", "70000")
+    monkeypatch.setenv("WHISPER_DEVICE", "tpu")
+    with pytest.raises(ValueError):
+        unresolved_config.validate()
+    assert "PORT=70000 is above maximum 65535" in caplog.text
+    assert "WHISPER_DEVICE='tpu' must be one of: cpu, cuda" in caplog.text
@@ -0,0 +1,102 @@
+"""
+Tests for the environment configuration validator
+"""
+import pytest
+
+import config_validator
+from config_validator import ConfigValidator
+
+
+@pytest.fixture(autouse=True)
+def clean_env(monkeypatch):
+    for key in config_validator._VALIDATED_KEYS:
+        monkeypatch.delenv(key, raising=False)
+    monkeypatch.setenv("SECRET_KEY", "x" * 40)
+    ConfigValidator.clear_cache()
+    yield
+    ConfigValidator.clear_cache()
+
+
+def test_valid_environment():
+    assert ConfigValidator().validate_all() == (True, [], [])
+
+
+def test_reports_invalid_values(monkeypatch):
+    monkeypatch.setenv("PORT", "70000")
+    monkeypatch.setenv("WHISPER_DEVICE", "tpu")
+    is_valid, errors, _ = ConfigValidator().validate_all()
+    assert not is_valid
+    assert errors == [
+        "PORT=70000 is above maximum 65535",
+        "WHISPER_DEVICE='tpu' must be one of: cpu, cuda",
+    ]
+
+
+def test_bcrypt_cost_range(monkeypatch):
+    monkeypatch.setenv("BCRYPT_COST", "auto")
+    assert ConfigValidator().validate_all()[0]
+    monkeypatch.setenv("BCRYPT_COST", "40")
+    assert ConfigValidator().validate_all()[1] == ["BCRYPT_COST=40 is above maximum 31"]
+
+
+def test_results_are_memoized_per_environment(monkeypatch):
+    calls = []
+    run = ConfigValidator._run_validations
+    monkeypatch.setattr(ConfigValidator, "_run_validations", lambda self, env: calls.append(1) or run(self, env))
+
+    validator = ConfigValidator()
+    validator.validate_all()
+    validator.validate_all()
+    assert len(calls) == 1
+
+    # Callers get their own lists, so mutating them leaves the cache intact
+    validator.errors.append("mutated")
+    assert ConfigValidator().validate_all() == (True, [], [])
+
+    monkeypatch.setenv("PORT", "0")
+    assert not validator.validate_all()[0]
+    assert len(calls) == 2
+
+
+def test_validates_cast_config_attributes():
+    class Cfg:
+        SECRET_KEY = "x" * 40
+        DEBUG = False
+        PORT = 0
+        REDIS_ENABLED = True
+        REDIS_PORT = 6379
+        REDIS_TTL = 3600
+        WHISPER_DEVICE = "cpu"
+
+    is_valid, errors, _ = ConfigValidator().validate_all(Cfg)
+    assert not is_valid
+    assert errors == ["PORT=0 is below minimum 1"]
+
+
+def test_uncastable_config_attribute_is_reported(monkeypatch):
+    from config import Config
+
+    cached = dict(vars(Config))
+    if "PORT" in cached:
+        delattr(Config, "PORT")  # Resolve PORT from the environment again
+    monkeypatch.setenv("PORT", "abc")
+    try:
+        is_valid, errors, _ = ConfigValidator().validate_all(Config)
+    finally:
+        # Restore the attributes resolved before and drop those resolved while validating
+        for name in set(vars(Config)) - set(cached):
+            delattr(Config, name)
+        if "PORT" in cached:
+            Config.PORT = cached["PORT"]
+    assert not is_valid
+    assert errors == ["PORT='abc' is not a valid integer"]
+
+
+def test_messages_are_lists_after_validation(monkeypatch):
+    validator = ConfigValidator()
+    assert validator.errors == () and validator.warnings == ()
+    monkeypatch.setenv("PORT", "0")
+    validator.validate_all()
+    # validate_all always hands back lists, so callers may append to them
+    assert isinstance(validator.errors, list) and isinstance(validator.warnings, list)
+    validator.errors.append("extra")
@@ -0,0 +1,266 @@
+"""
+Tests for the SQLite user/session/chat store
+"""
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+import database as db
+
+
+def test_connections_use_wal(fresh_db):
+    with db.get_db_connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+
+
+def test_chat_history_round_trip(fresh_db):
+    user = db.create_user("alice", "alice@example.com", "Secret123")
+    assert user["success"]
+    db.save_chat(user["user_id"], "top fintech deals", "en", "x" * 300)
+    db.save_chat(user["user_id"], "bengaluru funding", "en", "short answer")
+
+    history = db.get_chat_history(user["user_id"])
+    assert history["total"] == 2
+    assert {c["query"] for c in history["chats"]} == {"bengaluru funding", "top fintech deals"}
+    long_chat = next(c for c in history["chats"] if c["query"] == "top fintech deals")
+    assert long_chat["response_preview"] == "x" * 200 + "..."
+
+    assert db.clear_chat_history(user["user_id"]) == 2
+    assert db.get_chat_history(user["user_id"])["total"] == 0
+
+
+def test_login_and_token(fresh_db):
+    db.create_user("bob", "bob@example.com", "Secret123")
+    assert db.authenticate_user("bob", "wrong") is None
+    session = db.authenticate_user("bob", "Secret123")
+    assert db.verify_token(session["token"])["username"] == "bob"
+    db.logout_user(session["token"])
+    assert db.verify_token(session["token"]) is None
+
+
+def test_chats_are_written_in_batches(fresh_db, monkeypatch):
+    user = db.create_user("dave", "dave@example.com", "Secret123")
+    writer_transactions = []
+    get_connection = db.get_db_connection
+
+    def counting_connection():
+        if threading.current_thread().name == "chat-writer":
+            writer_transactions.append(1)
+        return get_connection()
+
+    monkeypatch.setattr(db, "get_db_connection", counting_connection)
+    monkeypatch.setattr(db, "_CHAT_FLUSH_INTERVAL", 1.0)
+    for i in range(5):
+        db.save_chat(user["user_id"], f"query {i}", "en", "answer")
+
+    db._chat_queue.join()  # Let the writer drain the queue on its own
+    assert len(writer_transactions) == 1
+    assert db.get_chat_history(user["user_id"])["total"] == 5
+
+
+def test_history_read_flushes_only_own_chats(fresh_db, monkeypatch):
+    alice = db.create_user("nia", "nia@example.com", "Secret123")
+    bob = db.create_user("oli", "oli@example.com", "Secret123")
+    monkeypatch.setattr(db, "_CHAT_FLUSH_INTERVAL", 2.0)
+    db.save_chat(alice["user_id"], "alice asks", "en", "answer")
+    db.save_chat(bob["user_id"], "bob asks", "en", "answer")
+
+    async def read():
+        return await db.get_chat_history_async(bob["user_id"])
+
+    started = time.monotonic()
+    history = asyncio.run(read())
+    assert time.monotonic() - started < 1.0  # Not held for the writer's batch window
+    assert [c["query"] for c in history["chats"]] == ["bob asks"]
+    assert not db._pending_chats.get(bob["user_id"])
+
+
+def test_save_chat_without_writer_is_synchronous(fresh_db):
+    user = db.create_user("erin", "erin@example.com", "Secret123")
+    db.stop_chat_writer()
+    db.save_chat(user["user_id"], "direct", "en", "answer")
+    with db.get_db_connection() as conn:
+        assert conn.execute("SELECT query FROM chat_history").fetchone()[0] == "direct"
+
+
+def test_purge_expired_sessions(fresh_db):
+    db.create_user("frank", "frank@example.com", "Secret123")
+    live = db.authenticate_user("frank", "Secret123")["token"]
+    expired = db.authenticate_user("frank", "Secret123")["token"]
+    with db.get_db_connection() as conn:
+        conn.execute("UPDATE sessions SET expires_at = '2000-01-01 00:00:00' WHERE token = ?", (expired,))
+        conn.commit()
+
+    assert db.purge_expired_sessions() == 1
+    assert db.verify_token(live) is not None
+    assert db.purge_expired_sessions() == 0
+
+
+def test_async_login_runs_on_bcrypt_pool(fresh_db):
+    async def signup_and_login():
+        created = await db.create_user_async("gina", "gina@example.com", "Secret123")
+        return created, await db.authenticate_user_async("gina", "Secret123")
+
+    created, session = asyncio.run(signup_and_login())
+    assert created["success"]
+    assert db.verify_token(session["token"])["user_id"] == created["user_id"]
+
+
+def test_bcrypt_cost_is_configurable(monkeypatch):
+    monkeypatch.setattr(db, "BCRYPT_COST", "10")
+    monkeypatch.setattr(db, "_bcrypt_rounds", None)
+    hashed = db.hash_password("Secret123")
+    assert hashed.startswith("$2b$10$")
+    assert db.verify_password("Secret123", hashed)
+
+
+@pytest.mark.parametrize("cost", ["abc", "3", "40"])
+def test_invalid_bcrypt_cost_fails_at_init(fresh_db, monkeypatch, cost):
+    monkeypatch.setattr(db, "BCRYPT_COST", cost)
+    monkeypatch.setattr(db, "_bcrypt_rounds", None)
+    with pytest.raises(ValueError, match="BCRYPT_COST"):
+        db.init_database()
+
+
+def test_calibrate_bcrypt_respects_bounds():
+    assert db.calibrate_bcrypt(target_ms=0) == 10
+    assert 10 <= db.calibrate_bcrypt(target_ms=50, max_rounds=11) <= 11
+
+
+def test_verify_token_is_cached_until_logout(fresh_db):
+    db.create_user("hank", "hank@example.com", "Secret123")
+    token = db.authenticate_user("hank", "Secret123")["token"]
+    assert db.verify_token(token)["username"] == "hank"
+
+    # A cache hit only probes the session row, never the sessions/users join
+    statements = []
+    with db.get_db_connection() as conn:
+        conn.set_trace_callback(statements.append)
+        try:
+            assert db.verify_token(token)["username"] == "hank"
+        finally:
+            conn.set_trace_callback(None)
+    assert statements == [db._SESSION_EXISTS.replace("?", repr(token))]
+
+    db.logout_user(token)
+    assert db.verify_token(token) is None
+
+
+def test_logout_in_another_worker_revokes_cached_token(fresh_db):
+    db.create_user("ian", "ian@example.com", "Secret123")
+    token = db.authenticate_user("ian", "Secret123")["token"]
+    assert db.verify_token(token)["username"] == "ian"  # Cached in this worker
+
+    # Another worker's logout deletes the row but cannot touch this cache
+    with db.get_db_connection() as conn:
+        conn.execute("DELETE FROM sessions WHERE token = ?", (token,))
+        conn.commit()
+    assert db.verify_token(token) is None
+    assert token not in db._token_cache
+
+
+def test_legacy_sessions_table_is_upgraded(fresh_db):
+    with db.get_db_connection() as conn:
+        conn.execute("DROP TABLE sessions")
+        conn.execute("""
+            CREATE TABLE sessions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER NOT NULL,
+                token TEXT UNIQUE NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                expires_at TIMESTAMP NOT NULL
+            )
+        """)
+        conn.execute("INSERT INTO sessions (user_id, token, expires_at) VALUES (1, 'old-token', '2999-01-01 00:00:00')")
+        conn.commit()
+
+    db.init_database()
+    with db.get_db_connection() as conn:
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(sessions)")]
+        assert columns == ["token", "user_id", "created_at", "expires_at"]
+        assert conn.execute("SELECT user_id FROM sessions WHERE token = 'old-token'").fetchone()[0] == 1
+        plan = " ".join(row[3] for row in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT COUNT(*) FROM chat_history WHERE user_id = 1 AND language = 'en'"))
+        assert "COVERING INDEX idx_chat_history_covering" in plan
+
+
+def test_chat_history_pagination(fresh_db):
+    user = db.create_user("ivy", "ivy@example.com", "Secret123")
+    for i in range(5):
+        db.save_chat(user["user_id"], f"query {i}", "hi" if i % 2 else "en", "answer")
+
+    page = db.get_chat_history(user["user_id"], limit=2, offset=2)
+    assert (len(page["chats"]), page["total"], page["has_more"], page["total_pages"]) == (2, 5, True, 3)
+
+    hindi = db.get_chat_history(user["user_id"], language="hi")
+    assert hindi["total"] == 2 and all(c["language"] == "hi" for c in hindi["chats"])
+
+    beyond = db.get_chat_history(user["user_id"], limit=2, offset=10)
+    assert (beyond["chats"], beyond["total"], beyond["has_more"]) == ([], 5, False)
+
+
+def test_chat_history_preview(fresh_db):
+    user = db.create_user("kim", "kim@example.com", "Secret123")
+    long_answer = "फंडिंग " * 100
+    db.save_chat(user["user_id"], "long", "hi", long_answer)
+    db.save_chat(user["user_id"], "short", "en", "ok")
+
+    chats = {c["query"]: c for c in db.get_chat_history(user["user_id"])["chats"]}
+    assert chats["long"]["response"] == long_answer
+    assert chats["long"]["response_preview"] == long_answer[:200] + "..."
+    assert chats["short"]["response_preview"] == "ok"
+
+
+def test_chat_history_search(fresh_db):
+    assert db._fts_enabled
+    user = db.create_user("jack", "jack@example.com", "Secret123")
+    db.save_chat(user["user_id"], "Fintech deals in Pune", "en", "Razorpay raised...")
+    db.save_chat(user["user_id"], "Edtech in Delhi", "en", 'The "BYJU\'S" round')
+    db.save_chat(user["user_id"], "Healthtech", "en", "none found")
+
+    def found(search):
+        return sorted(c["query"] for c in db.get_chat_history(user["user_id"], search=search)["chats"])
+
+    assert found("FINTECH") == ["Fintech deals in Pune"]
+    assert found("tech") == ["Edtech in Delhi", "Fintech deals in Pune", "Healthtech"]
+    assert found("azorp") == ["Fintech deals in Pune"]  # Substring of the response
+    assert found('"BYJU') == ["Edtech in Delhi"]
+    assert found("Pu") == ["Fintech deals in Pune"]  # Short search falls back to LIKE
+
+    # Index follows deletes
+    db.clear_chat_history(user["user_id"])
+    assert found("tech") == []
+
+
+def test_clear_chat_history_in_batches(fresh_db, monkeypatch):
+    monkeypatch.setattr(db, "_CLEAR_BATCH_SIZE", 2)
+    alice = db.create_user("lee", "lee@example.com", "Secret123")
+    bob = db.create_user("max", "max@example.com", "Secret123")
+    for i in range(5):
+        db.save_chat(alice["user_id"], f"query {i}", "en", "answer")
+    db.save_chat(bob["user_id"], "kept", "en", "answer")
+
+    assert db.clear_chat_history(alice["user_id"]) == 5
+    assert db.get_chat_history(alice["user_id"])["total"] == 0
+    assert db.get_chat_history(bob["user_id"])["total"] == 1
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_forked_child_opens_its_own_connection(fresh_db):
+    with db.get_db_connection() as conn:
+        parent_conn = conn
+
+    pid = os.fork()
+    if pid == 0:
+        ok = False
+        try:
+            with db.get_db_connection() as conn:
+                ok = conn is not parent_conn and conn.execute("SELECT COUNT(*) FROM users").fetchone()[0] == 0
+        finally:
+            os._exit(0 if ok else 1)
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
@@ -0,0 +1,34 @@
+"""
+Tests for cached .env loading
+"""
+import env_cache
+
+
+def test_unchanged_file_is_not_reparsed(tmp_path, monkeypatch):
+    env_file = tmp_path / ".env"
+    env_file.write_text("PROMETHEUS_TEST_VAR=first\n")
+    monkeypatch.delenv("PROMETHEUS_TEST_VAR", raising=False)
+    monkeypatch.delenv(env_cache._MARKER, raising=False)
+    env_cache.clear_cache()
+
+    calls = []
+    parse = env_cache.dotenv_values
+    monkeypatch.setattr(env_cache, "dotenv_values", lambda path: calls.append(path) or parse(path))
+
+    assert env_cache.load_env(str(env_file))
+    assert env_cache.load_env(str(env_file))
+    assert len(calls) == 1
+    assert env_cache.os.environ["PROMETHEUS_TEST_VAR"] == "first"
+
+    # A changed file is parsed again, without overriding variables already set
+    env_file.write_text("PROMETHEUS_TEST_VAR=second\nPROMETHEUS_TEST_OTHER=x\n")
+    monkeypatch.delenv("PROMETHEUS_TEST_OTHER", raising=False)
+    assert env_cache.load_env(str(env_file))
+    assert len(calls) == 2
+    assert env_cache.os.environ["PROMETHEUS_TEST_VAR"] == "first"
+    assert env_cache.os.environ["PROMETHEUS_TEST_OTHER"] == "x"
+    env_cache.clear_cache()
+
+
+def test_missing_file(tmp_path):
+    assert not env_cache.load_env(str(tmp_path / "missing.env"))
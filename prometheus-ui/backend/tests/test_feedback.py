@@ -0,0 +1,42 @@
+"""
+Tests for response feedback storage
+"""
+import feedback
+
+
+def test_feedback_stats_and_low_rated(fresh_db):
+    feedback.init_feedback_table()
+    user = fresh_db.create_user("carol", "carol@example.com", "Secret123")
+    fresh_db.save_chat(user["user_id"], "worst answer", "en", "wrong")
+    chat_id = fresh_db.get_chat_history(user["user_id"])["chats"][0]["id"]
+
+    feedback.save_feedback(chat_id, user["user_id"], 1)
+    feedback.save_feedback(chat_id, user["user_id"], 1)
+    feedback.save_feedback(chat_id, user["user_id"], -1, "made up numbers")
+
+    stats = feedback.get_feedback_stats()
+    assert stats["total"] == 3
+    assert stats["thumbs_up"] == 2
+    assert stats["thumbs_down"] == 1
+    assert abs(stats["satisfaction_rate"] - 2 / 3) < 1e-9
+
+    low = feedback.get_low_rated_queries()
+    assert [(r["query"], r["comment"]) for r in low] == [("worst answer", "made up numbers")]
+
+
+def test_feedback_stats_cache(fresh_db):
+    feedback.init_feedback_table()
+    assert feedback.get_feedback_stats() == {
+        "total": 0, "thumbs_up": 0, "thumbs_down": 0, "satisfaction_rate": None
+    }
+
+    # Saving feedback invalidates the cached stats
+    feedback.save_feedback(1, 1, -1)
+    assert feedback.get_feedback_stats()["thumbs_down"] == 1
+
+    # Counted from the rating index, not the table
+    with fresh_db.get_db_connection() as conn:
+        plan = " ".join(row[3] for row in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT COUNT(*) FILTER (WHERE rating = 1) FROM feedback"
+        ))
+    assert "idx_feedback_rating" in plan
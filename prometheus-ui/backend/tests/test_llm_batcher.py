@@ -0,0 +1,115 @@
+"""
+Tests for Ollama micro-batching
+"""
+import asyncio
+import concurrent.futures
+import threading
+
+import pytest
+
+from llm_batcher import OllamaBatcher
+
+
+class FakeAsyncClient:
+    def __init__(self):
+        self.prompts = []
+
+    async def generate(self, **kwargs):
+        self.prompts.append(kwargs["prompt"])
+        await asyncio.sleep(0)
+        return {"response": kwargs["prompt"].upper()}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_are_batched():
+    batcher = OllamaBatcher(window=0.05, max_batch=8)
+    await batcher.start()
+    batcher._client = FakeAsyncClient()
+
+    results = {}
+
+    def worker(prompt):
+        results[prompt] = batcher.generate(model="m", prompt=prompt)["response"]
+
+    threads = [threading.Thread(target=worker, args=(f"q{i}",)) for i in range(4)]
+    for t in threads:
+        t.start()
+    await asyncio.to_thread(lambda: [t.join() for t in threads])
+    await batcher.stop()
+
+    assert results == {f"q{i}": f"Q{i}" for i in range(4)}
+    assert sorted(batcher._client.prompts) == [f"q{i}" for i in range(4)]
+
+
+@pytest.mark.asyncio
+async def test_errors_propagate_to_caller():
+    batcher = OllamaBatcher(window=0.01)
+    await batcher.start()
+
+    class FailingClient:
+        async def generate(self, **kwargs):
+            raise RuntimeError("ollama down")
+
+    batcher._client = FailingClient()
+    with pytest.raises(RuntimeError, match="ollama down"):
+        await asyncio.to_thread(batcher.generate, model="m", prompt="x")
+    await batcher.stop()
+
+
+def test_repeated_prompt_served_from_cache(monkeypatch):
+    calls = []
+
+    def fake_generate(**kwargs):
+        calls.append(kwargs["prompt"])
+        return {"response": "answer"}
+
+    monkeypatch.setattr("llm_batcher.ollama.generate", fake_generate)
+    batcher = OllamaBatcher()
+
+    options = {"temperature": 0.3}
+    assert batcher.generate(model="m", prompt="p", options=options)["response"] == "answer"
+    assert batcher.generate(model="m", prompt="p", options=options)["response"] == "answer"
+    assert calls == ["p"]
+
+    # Different options are a different generation
+    batcher.generate(model="m", prompt="p", options={"temperature": 0.0})
+    assert calls == ["p", "p"]
+
+    assert batcher.clear_cache() == 2
+    batcher.generate(model="m", prompt="p", options=options)
+    assert calls == ["p", "p", "p"]
+
+
+class HangingClient:
+    async def generate(self, **kwargs):
+        await asyncio.Event().wait()
+
+
+@pytest.mark.asyncio
+async def test_stop_fails_pending_calls():
+    batcher = OllamaBatcher(window=0.01, max_batch=1)
+    await batcher.start()
+    batcher._client = HangingClient()
+
+    # One call in flight, the rest queued behind the single slot
+    calls = [asyncio.create_task(asyncio.to_thread(batcher.generate, model="m", prompt=f"q{i}"))
+             for i in range(3)]
+    while not batcher._inflight:
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(0.05)
+    await batcher.stop()
+
+    results = await asyncio.wait_for(asyncio.gather(*calls, return_exceptions=True), 5)
+    assert all(isinstance(r, RuntimeError) and "stopped" in str(r) for r in results)
+    assert not batcher._inflight
+
+
+@pytest.mark.asyncio
+async def test_caller_times_out():
+    batcher = OllamaBatcher(window=0.01)
+    await batcher.start(timeout=0.1)
+    batcher._client = HangingClient()
+
+    with pytest.raises(concurrent.futures.TimeoutError):
+        await asyncio.to_thread(batcher.generate, model="m", prompt="x")
+    await batcher.stop()
@@ -0,0 +1,53 @@
+"""
+Tests for queue-based logging setup
+"""
+import logging
+from logging.handlers import QueueHandler
+
+from utils.log_queue import start_queue_logging
+
+
+def test_records_reach_original_handlers():
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    records = []
+
+    class ListHandler(logging.Handler):
+        def emit(self, record):
+            records.append(record.getMessage())
+
+    root.handlers = [ListHandler()]
+    root.setLevel(logging.INFO)
+    try:
+        listener = start_queue_logging()
+        assert len(root.handlers) == 1 and isinstance(root.handlers[0], QueueHandler)
+
+        logging.getLogger("prometheus.test").info("hello from queue")
+        listener.stop()  # Flushes the queue
+        assert records == ["hello from queue"]
+    finally:
+        root.handlers = saved_handlers
+        root.setLevel(saved_level)
+
+
+def test_reentry_reuses_listener_and_stop_restores_handlers():
+    root = logging.getLogger()
+    saved_handlers = root.handlers[:]
+    original = logging.StreamHandler()
+    root.handlers = [original]
+    try:
+        first = start_queue_logging()
+        second = start_queue_logging()
+        assert second is first
+        assert root.handlers == [first.queue_handler]
+
+        # Still queued while another user is active
+        first.stop()
+        assert root.handlers == [first.queue_handler]
+
+        second.stop()
+        assert root.handlers == [original]
+        second.stop()  # Idempotent
+        assert root.handlers == [original]
+    finally:
+        root.handlers = saved_handlers
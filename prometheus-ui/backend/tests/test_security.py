@@ -0,0 +1,49 @@
+"""
+Unit tests for security middleware
+"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from security import LiteCORS
+
+
+@pytest.fixture
+def client():
+    """Create test client for an app wrapped in LiteCORS"""
+    app = FastAPI()
+    app.add_middleware(LiteCORS, origins=["http://localhost:5173"])
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+class TestLiteCORS:
+    """Test pure ASGI CORS middleware"""
+
+    def test_allowed_origin_gets_headers(self, client):
+        """Test simple request from an allowed origin"""
+        response = client.get("/ping", headers={"Origin": "http://localhost:5173"})
+        assert response.status_code == 200
+        assert response.headers["access-control-allow-origin"] == "http://localhost:5173"
+        assert response.headers["access-control-allow-credentials"] == "true"
+
+    def test_unknown_origin_gets_no_headers(self, client):
+        """Test request from a disallowed origin"""
+        response = client.get("/ping", headers={"Origin": "http://evil.example"})
+        assert response.status_code == 200
+        assert "access-control-allow-origin" not in response.headers
+
+    def test_preflight_answered_inline(self, client):
+        """Test OPTIONS preflight is answered without hitting the app"""
+        response = client.options("/ping", headers={
+            "Origin": "http://localhost:5173",
+            "Access-Control-Request-Method": "POST",
+            "Access-Control-Request-Headers": "authorization, content-type",
+        })
+        assert response.status_code == 200
+        assert response.headers["access-control-allow-headers"] == "authorization, content-type"
+        assert "POST" in response.headers["access-control-allow-methods"]
@@ -0,0 +1,65 @@
+"""
+Unit tests for the semantic RAG answer cache
+"""
+import numpy as np
+
+from semantic_cache import SemanticCache
+
+
+class TestSemanticCache:
+    """Test embedding-keyed response caching"""
+
+    def test_hit_on_similar_embedding(self):
+        """Test near-identical embedding returns cached response"""
+        cache = SemanticCache(threshold=0.95)
+        cache.put("fintech startups", "en", np.array([1.0, 0.0, 0.0]), {"answer": "a", "sources": []})
+        hit = cache.get("fintech startup", "en", np.array([0.99, 0.01, 0.0]))
+        assert hit == {"answer": "a", "sources": []}
+
+    def test_miss_on_dissimilar_embedding(self):
+        """Test unrelated embedding misses"""
+        cache = SemanticCache(threshold=0.95)
+        cache.put("fintech startups", "en", np.array([1.0, 0.0, 0.0]), {"answer": "a", "sources": []})
+        assert cache.get("edtech startups", "en", np.array([0.0, 1.0, 0.0])) is None
+
+    def test_language_and_numbers_are_separate_buckets(self):
+        """Test language and numeric tokens must match exactly"""
+        cache = SemanticCache(threshold=0.5)
+        emb = np.array([1.0, 0.0])
+        cache.put("top 5 fintech 2019", "en", emb, {"answer": "a", "sources": []})
+        assert cache.get("top 5 fintech 2019", "hi", emb) is None
+        assert cache.get("top 10 fintech 2019", "en", emb) is None
+        assert cache.get("top 5 fintech 2019", "en", emb) is not None
+
+    def test_fifo_eviction(self):
+        """Test oldest entry is evicted when full"""
+        cache = SemanticCache(threshold=0.99, max_entries=2)
+        cache.put("a", "en", np.array([1.0, 0.0]), {"answer": "a"})
+        cache.put("b", "en", np.array([0.0, 1.0]), {"answer": "b"})
+        cache.put("c", "en", np.array([-1.0, 0.0]), {"answer": "c"})
+        assert len(cache) == 2
+        assert cache.get("a", "en", np.array([1.0, 0.0])) is None
+        assert cache.get("c", "en", np.array([-1.0, 0.0])) == {"answer": "c"}
+
+    def test_fifo_eviction_across_buckets(self):
+        """Test the globally oldest entry is evicted, not the first bucket's"""
+        cache = SemanticCache(threshold=0.99, max_entries=3)
+        cache.put("first en", "en", np.array([1.0, 0.0]), {"answer": "first en"})
+        cache.put("first hi", "hi", np.array([1.0, 0.0]), {"answer": "first hi"})
+        cache.put("second en", "en", np.array([0.0, 1.0]), {"answer": "second en"})
+        cache.put("first ta", "ta", np.array([1.0, 0.0]), {"answer": "first ta"})  # Evicts first en
+        cache.put("second ta", "ta", np.array([0.0, 1.0]), {"answer": "second ta"})  # Evicts first hi
+        assert len(cache) == 3
+        assert cache.get("first en", "en", np.array([1.0, 0.0])) is None
+        assert cache.get("first hi", "hi", np.array([1.0, 0.0])) is None
+        assert cache.get("second en", "en", np.array([0.0, 1.0])) == {"answer": "second en"}
+        assert cache.get("first ta", "ta", np.array([1.0, 0.0])) == {"answer": "first ta"}
+
+    def test_scope_separates_entities(self):
+        """Test queries about different cities never share an answer"""
+        cache = SemanticCache(threshold=0.5)
+        emb = np.array([1.0, 0.0])
+        mumbai = (("Fintech",), "Mumbai", ())
+        cache.put("fintech funding in Mumbai", "en", emb, {"answer": "mumbai"}, mumbai)
+        assert cache.get("fintech funding in Pune", "en", emb, (("Fintech",), "Pune", ())) is None
+        assert cache.get("fintech funding in Mumbai", "en", emb, mumbai) == {"answer": "mumbai"}
@@ -0,0 +1,42 @@
+"""
+Tests for the in-memory FP16 vector index
+"""
+import numpy as np
+import pytest
+
+from vector_index import VectorIndex
+
+
+@pytest.fixture
+def index():
+    idx = VectorIndex()
+    embeddings = np.array([
+        [1.0, 0.0, 0.0],
+        [0.9, 0.1, 0.0],
+        [0.0, 1.0, 0.0],
+        [0.0, 0.0, 1.0],
+    ])
+    metadatas = [
+        {"company": "A", "year": "2020", "sector": "Fintech", "city": "Mumbai"},
+        {"company": "B", "year": "2021", "sector": "Fintech", "city": "Bangalore"},
+        {"company": "C", "year": "2020", "sector": "Edtech", "city": "Mumbai"},
+        {"company": "D", "year": "2021", "sector": "Healthcare"},
+    ]
+    idx.build(embeddings, metadatas)
+    return idx
+
+
+def test_query_returns_best_first(index):
+    results = index.query([1.0, 0.0, 0.0], n_results=2)
+    assert [m["company"] for m, _ in results] == ["A", "B"]
+    assert results[0][1] == pytest.approx(1.0, abs=1e-3)
+
+
+def test_query_applies_filters(index):
+    results = index.query([1.0, 0.0, 0.0], n_results=10, filters={"year": "2020", "city": "Mumbai"})
+    assert [m["company"] for m, _ in results] == ["A", "C"]
+
+
+def test_query_no_matches(index):
+    assert index.query([1.0, 0.0, 0.0], filters={"city": "Pune"}) == []
+    assert VectorIndex().query([1.0, 0.0, 0.0]) == []
@@ -0,0 +1,63 @@
+"""
+Validate Prometheus environment configuration ahead of startup
+Runs the full ConfigValidator checks against backend/.env (or .env.example
+when no .env exists), so the server itself only checks SECRET_KEY on import.
+
+Usage:
+    python prometheus-ui/backend/tools/validate_config.py [ENV_FILE]
+    python prometheus-ui/backend/tools/validate_config.py --check-duplicates
+"""
+import os
+import re
+import sys
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from config_validator import validate_config  # noqa: E402
+
+_CONFIG_CLASS_RE = re.compile(r"^class Config\b", re.MULTILINE)
+
+
+def find_config_classes() -> list:
+    """Return every backend module defining a top-level `class Config`"""
+    return [
+        path.relative_to(BACKEND_DIR)
+        for path in sorted(BACKEND_DIR.rglob("*.py"))
+        if _CONFIG_CLASS_RE.search(path.read_text(encoding="utf-8", errors="ignore"))
+    ]
+
+
+def check_duplicates() -> int:
+    """Fail when Config is defined anywhere besides config.py"""
+    definitions = find_config_classes()
+    if definitions != [Path("config.py")]:
+        print(f"❌ Expected a single Config class in config.py, found: {[str(p) for p in definitions]}")
+        return 1
+    return 0
+
+
+def main() -> int:
+    if sys.argv[1:] == ["--check-duplicates"]:
+        return check_duplicates()
+
+    if len(sys.argv) > 1:
+        env_file = Path(sys.argv[1])
+    else:
+        env_file = BACKEND_DIR / ".env"
+        if not env_file.exists():
+            env_file = BACKEND_DIR / ".env.example"
+
+    load_dotenv(env_file)
+    # Relative paths in the env file are relative to the backend directory
+    os.chdir(BACKEND_DIR)
+    validate_config()
+    print(f"✅ Configuration is valid ({env_file.name})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,10 +3,12 @@ Utils package initialization
 """
 from .amount_utils import parse_amount_to_numeric, format_amount
 from .transliteration import transliterate_company_name, reverse_transliterate_company_name
+from .log_queue import start_queue_logging
 
 __all__ = [
     "parse_amount_to_numeric",
     "format_amount",
     "transliterate_company_name",
-    "reverse_transliterate_company_name"
+    "reverse_transliterate_company_name",
+    "start_queue_logging"
 ]
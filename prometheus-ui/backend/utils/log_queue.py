@@ -0,0 +1,68 @@
+"""
+Queue-based logging
+Request handlers only enqueue log records; a background listener thread does
+the formatting and stream I/O, so slow stdout never blocks the event loop
+"""
+import logging
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+_lock = threading.Lock()
+_active: "QueueLogging | None" = None
+
+
+class QueueLogging:
+    """Handle for the root logger's queue setup; stop() undoes it"""
+
+    def __init__(self, handlers: list):
+        self.handlers = handlers
+        self.queue_handler = QueueHandler(queue.SimpleQueue())
+        self.listener = QueueListener(self.queue_handler.queue, *handlers, respect_handler_level=True)
+        self._users = 0
+
+    def stop(self):
+        """
+        Release this user's hold on queue logging
+
+        When the last user stops, the listener is flushed and stopped and the
+        original handlers go back on the root logger, so records logged after
+        shutdown are still written.
+        """
+        global _active
+        with _lock:
+            if self._users == 0:
+                return  # Already stopped
+            self._users -= 1
+            if self._users > 0:
+                return
+            root = logging.getLogger()
+            root.removeHandler(self.queue_handler)
+            self.listener.stop()
+            for handler in self.handlers:
+                root.addHandler(handler)
+            if _active is self:
+                _active = None
+
+
+def start_queue_logging() -> QueueLogging:
+    """
+    Move the root logger's handlers behind a QueueHandler
+
+    The existing handlers (from logging.basicConfig) keep their format and
+    level and are driven by a listener thread. Calling this again while queue
+    logging is active (reload, several apps in one process) reuses the same
+    listener; each caller must call stop() on the returned handle on shutdown.
+    """
+    global _active
+    with _lock:
+        if _active is None:
+            root = logging.getLogger()
+            handlers = [h for h in root.handlers if not isinstance(h, QueueHandler)] or [logging.StreamHandler()]
+            _active = QueueLogging(handlers)
+            for handler in handlers:
+                root.removeHandler(handler)
+            root.addHandler(_active.queue_handler)
+            _active.listener.start()
+        _active._users += 1
+        return _active
@@ -4,6 +4,7 @@ Includes batch processing, pagination, and query optimization
 """
 import time
 import logging
+from statistics import fmean
 from typing import List, Dict, Any, Optional, TypeVar, Generic
 from dataclasses import dataclass
 from functools import wraps
@@ -147,7 +148,7 @@ class PerformanceMonitor:
             "count": len(values),
             "min": min(values),
             "max": max(values),
-            "avg": sum(values) / len(values),
+            "avg": fmean(values),
             "total": sum(values)
         }
     
@@ -0,0 +1,90 @@
+"""
+In-memory FP16 vector index for RAG retrieval
+A single matrix-vector product over normalized embeddings answers top-k
+queries for the funding dataset without any per-query HNSW/ChromaDB overhead
+"""
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class VectorIndex:
+    """Brute-force cosine similarity index backed by a float16 matrix"""
+
+    # Metadata fields that can be used as equality filters
+    FILTER_FIELDS = ("year", "sector", "city")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.embeddings: Optional[np.ndarray] = None
+        self.metadatas: List[dict] = []
+        self._columns: Dict[str, np.ndarray] = {}
+
+    @staticmethod
+    def _normalize(matrix) -> np.ndarray:
+        matrix = np.asarray(matrix, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def build(self, embeddings, metadatas: List[dict]):
+        """Replace index contents with the given embeddings and metadata"""
+        if len(embeddings) != len(metadatas):
+            raise ValueError("embeddings and metadatas must have the same length")
+
+        matrix = self._normalize(embeddings).astype(np.float16)
+        columns = {
+            field: np.array([str(m.get(field, '')) for m in metadatas], dtype=object)
+            for field in self.FILTER_FIELDS
+        }
+        with self._lock:
+            self.embeddings = matrix
+            self.metadatas = list(metadatas)
+            self._columns = columns
+        logger.info(f"Vector index built with {len(metadatas)} documents")
+
+    def query(self, embedding, n_results: int = 10, filters: Optional[dict] = None) -> List[Tuple[dict, float]]:
+        """
+        Return the top n_results (metadata, similarity) pairs, best first
+
+        Args:
+            embedding: Query embedding (normalized internally)
+            n_results: Maximum number of results
+            filters: Optional {field: value} equality filters on FILTER_FIELDS
+        """
+        with self._lock:
+            matrix = self.embeddings
+            metadatas = self.metadatas
+            columns = self._columns
+        if matrix is None or not metadatas:
+            return []
+
+        query_vec = self._normalize(np.ravel(embedding)).astype(np.float16)
+        scores = (matrix @ query_vec).astype(np.float32)
+
+        candidates = None
+        if filters:
+            mask = np.ones(len(metadatas), dtype=bool)
+            for field, value in filters.items():
+                mask &= columns[field] == str(value)
+            candidates = np.flatnonzero(mask)
+            scores = scores[candidates]
+
+        k = min(n_results, len(scores))
+        if k == 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        rows = candidates[top] if candidates is not None else top
+        return [(metadatas[row], float(scores[i])) for row, i in zip(rows, top)]
+
+    def __len__(self) -> int:
+        return len(self.metadatas)
+
+
+# Global vector index instance
+vector_index = VectorIndex()
@@ -1,6 +1,7 @@
 """Quick test to validate Prometheus RAG responses"""
 import requests
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 BASE_URL = "http://localhost:8000"
 
@@ -21,15 +22,11 @@ test_queries = [
     {"query": "2024 இல் எட்டெக் நிதி காட்டு", "lang": "ta", "name": "Tamil - EdTech 2024"},
 ]
 
-print("\n🚀 PROMETHEUS QUICK TEST\n" + "="*60)
+MAX_WORKERS = 4  # Concurrent queries; keep low so the backend/Ollama is not flooded
 
-passed = 0
-failed = 0
 
-for test in test_queries:
-    print(f"\n📝 {test['name']}")
-    print(f"   Query: {test['query']}")
-    
+def run_test(test):
+    """Send one query and return (test, outcome, duration, detail)"""
     try:
         start = time.time()
         response = requests.post(
@@ -40,24 +37,44 @@ for test in test_queries:
         duration = time.time() - start
         
         if response.status_code == 200:
-            data = response.json()
-            answer = data.get("answer", "")
+            answer = response.json().get("answer", "")
             
             # Check if response is valid
             if len(answer) > 50 and "₹" in answer:
-                print(f"   ✅ PASS ({duration:.2f}s)")
-                print(f"   Preview: {answer[:150]}...")
-                passed += 1
-            else:
-                print(f"   ❌ FAIL - Short or invalid response ({duration:.2f}s)")
-                print(f"   Answer: {answer}")
-                failed += 1
-        else:
-            print(f"   ❌ FAIL - HTTP {response.status_code}")
-            failed += 1
-            
+                return test, "pass", duration, answer
+            return test, "invalid", duration, answer
+        return test, "http", duration, response.status_code
+    
     except Exception as e:
-        print(f"   ❌ ERROR: {e}")
+        return test, "error", 0.0, e
+
+
+print("\n🚀 PROMETHEUS QUICK TEST\n" + "="*60)
+
+# Queries are network-bound, so run them concurrently and report in order
+with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+    outcomes = list(executor.map(run_test, test_queries))
+
+passed = 0
+failed = 0
+
+for test, outcome, duration, detail in outcomes:
+    print(f"\n📝 {test['name']}")
+    print(f"   Query: {test['query']}")
+    
+    if outcome == "pass":
+        print(f"   ✅ PASS ({duration:.2f}s)")
+        print(f"   Preview: {detail[:150]}...")
+        passed += 1
+    elif outcome == "invalid":
+        print(f"   ❌ FAIL - Short or invalid response ({duration:.2f}s)")
+        print(f"   Answer: {detail}")
+        failed += 1
+    elif outcome == "http":
+        print(f"   ❌ FAIL - HTTP {detail}")
+        failed += 1
+    else:
+        print(f"   ❌ ERROR: {detail}")
         failed += 1
 
 print(f"\n{'='*60}")